@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Course, Enrollment
+
+
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ("title", "site", "category", "rating", "viewers")
+    list_filter = ("site", "category")
+    search_fields = ("title", "skills")
+
+
+@admin.register(Enrollment)
+class EnrollmentAdmin(admin.ModelAdmin):
+    list_display = ("enrollment_id", "user_id", "course_name", "user_level", "enrolled_on")
+    list_filter = ("course_name", "user_level")
@@ -0,0 +1,228 @@
+"""
+Build the denormalized user x course table (fake_realistic_cleaned.csv
+shape) from the raw files:
+
+    fake_user_course_enrollments.csv   UserID, Course Title      (streamed)
+    fake_users.csv                     UserID, ..., ExperienceLevel
+    online_courses_cleaned_trimmed.csv Title, URL, ..., Site
+
+The enrollment file is read in chunks; each chunk is hash-joined in a
+worker process against user and course lookups that every worker loads
+once (courses keyed on a normalized title, so case/whitespace/Unicode
+variants and "..."-truncated titles still match). Rows are validated and
+de-duplicated on (UserID, course) across the whole run, and each finished
+chunk is appended to the Parquet (and optionally CSV) output, so memory
+stays bounded by chunk size x in-flight chunks plus the lookups.
+
+    python -m MLApp.etl --out fake_realistic_cleaned.parquet --csv fake_realistic_cleaned.csv
+
+Tools Used / Interest / Goal are not in fake_users.csv; pass them with
+--profiles (a CSV with UserID plus those columns) or they are left empty.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+COURSE_COLUMNS = [
+    "URL", "Short Intro", "Category", "Sub-Category", "Course Type", "Language",
+    "Subtitle Languages", "Skills", "Instructors", "Rating", "Number of viewers", "Duration", "Site",
+]
+PROFILE_COLUMNS = ["Tools Used", "Interest", "Goal"]
+OUTPUT_COLUMNS = ["Course Title"] + COURSE_COLUMNS + ["UserID", "Proficiency"] + PROFILE_COLUMNS
+OUTPUT_SCHEMA = pa.schema([(c, pa.string()) for c in OUTPUT_COLUMNS])
+
+_WS_RE = re.compile(r"\s+")
+_TRUNCATED_RE = re.compile(r"\s*(\.\.\.|…)$")
+
+
+def normalize_title(title) -> str:
+    if not isinstance(title, str):
+        return ""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFKC", title).casefold()).strip()
+
+
+# ---------------------------------------------------------------------
+# Lookups (loaded once per worker process)
+# ---------------------------------------------------------------------
+
+_courses: Optional[pd.DataFrame] = None
+_course_keys: list[str] = []
+_users: Optional[pd.DataFrame] = None
+
+
+def _load_lookups(courses_path: str, users_path: str, profiles_path: Optional[str]) -> None:
+    global _courses, _course_keys, _users
+
+    courses = pd.read_csv(courses_path, dtype=str, usecols=["Title"] + COURSE_COLUMNS)
+    courses["_key"] = courses["Title"].map(normalize_title)
+    courses = courses[courses["_key"] != ""].drop_duplicates("_key")  # first row wins for repeated titles
+    _courses = courses.set_index("_key")
+    _course_keys = sorted(_courses.index)
+
+    users = pd.read_csv(users_path, dtype=str, usecols=["UserID", "ExperienceLevel"])
+    users = users.rename(columns={"ExperienceLevel": "Proficiency"})
+    if profiles_path:
+        profiles = pd.read_csv(profiles_path, dtype=str, usecols=["UserID"] + PROFILE_COLUMNS)
+        users = users.merge(profiles.drop_duplicates("UserID"), on="UserID", how="left")
+    for c in PROFILE_COLUMNS:
+        if c not in users:
+            users[c] = None
+    users["UserID"] = users["UserID"].str.strip()
+    _users = users.drop_duplicates("UserID").set_index("UserID")
+
+
+def _resolve_truncated(key: str) -> Optional[str]:
+    """Map a '...'-truncated title to the only catalog title with that prefix."""
+    prefix = _TRUNCATED_RE.sub("", key)
+    if not prefix or prefix == key:
+        return None
+    i = bisect_left(_course_keys, prefix)
+    matches = []
+    while i < len(_course_keys) and _course_keys[i].startswith(prefix) and len(matches) < 2:
+        matches.append(_course_keys[i])
+        i += 1
+    return matches[0] if len(matches) == 1 else None
+
+
+def _transform(chunk: pd.DataFrame) -> tuple[pa.Table, np.ndarray, dict]:
+    """Validate, normalize and join one enrollment chunk. Runs in a worker."""
+    stats = {"read": len(chunk)}
+
+    chunk = chunk.rename(columns={"Title": "Course Title"})
+    uid = chunk["UserID"].fillna("").str.strip()
+    title = chunk["Course Title"].fillna("").str.strip()
+
+    header = (uid == "UserID") & title.isin(["Course Title", "Title"])  # repeated header lines
+    empty = (uid == "") | (title == "")
+    stats["header_rows"] = int(header.sum())
+    stats["invalid"] = int((empty & ~header).sum())
+    keep = ~(header | empty)
+    uid, title = uid[keep], title[keep]
+
+    key = title.map(normalize_title)
+    known = key.isin(_courses.index)
+    if (~known).any():
+        key = key.where(known, key[~known].map(lambda k: _resolve_truncated(k) or k))
+        known = key.isin(_courses.index)
+    stats["unmatched_course"] = int((~known).sum())
+
+    has_user = uid.isin(_users.index)
+    stats["unmatched_user"] = int((known & ~has_user).sum())
+    ok = known & has_user
+    pairs = pd.DataFrame({"UserID": uid[ok].values, "_key": key[ok].values})
+
+    before = len(pairs)
+    pairs = pairs.drop_duplicates()
+    stats["duplicates"] = before - len(pairs)
+
+    out = pairs.join(_courses, on="_key").join(_users, on="UserID")
+    out = out.rename(columns={"Title": "Course Title"})
+    hashes = pd.util.hash_pandas_object(out[["UserID", "_key"]], index=False).to_numpy(np.uint64)
+    table = pa.Table.from_pandas(out[OUTPUT_COLUMNS], schema=OUTPUT_SCHEMA, preserve_index=False)
+    return table, hashes, stats
+
+
+# ---------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------
+
+class _SeenPairs:
+    """Sorted uint64 hashes of written (UserID, course) pairs: 8 bytes per row."""
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.uint64)
+
+    def filter_new(self, hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask of hashes not seen before; records them as seen."""
+        seen = np.zeros(len(hashes), dtype=bool)
+        if len(self.keys):
+            pos = np.minimum(np.searchsorted(self.keys, hashes), len(self.keys) - 1)
+            seen = self.keys[pos] == hashes
+        new = hashes[~seen]
+        if len(new):
+            new = np.sort(new)
+            self.keys = np.insert(self.keys, np.searchsorted(self.keys, new), new)
+        return ~seen
+
+
+def build(enrollments: Path, users: Path, courses: Path, out: Path,
+          csv_out: Optional[Path] = None, profiles: Optional[Path] = None,
+          chunksize: int = 200_000, workers: Optional[int] = None) -> dict:
+    workers = workers or os.cpu_count() or 1
+    totals: dict[str, int] = {}
+    seen = _SeenPairs()
+    writer = pq.ParquetWriter(out, OUTPUT_SCHEMA, compression="zstd")
+    csv_writer = pacsv.CSVWriter(csv_out, OUTPUT_SCHEMA) if csv_out else None
+
+    def write(table: pa.Table, hashes: np.ndarray, stats: dict):
+        mask = seen.filter_new(hashes)
+        stats["duplicates"] += int((~mask).sum())
+        table = table.filter(pa.array(mask))
+        stats["written"] = table.num_rows
+        for k, v in stats.items():
+            totals[k] = totals.get(k, 0) + v
+        if table.num_rows:
+            writer.write_table(table)
+            if csv_writer:
+                csv_writer.write_table(table)
+
+    lookup_args = (str(courses), str(users), str(profiles) if profiles else None)
+    reader = pd.read_csv(enrollments, dtype=str, chunksize=chunksize, skipinitialspace=True)
+    try:
+        if workers == 1:
+            _load_lookups(*lookup_args)
+            for chunk in reader:
+                write(*_transform(chunk))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_load_lookups, initargs=lookup_args) as pool:
+                pending: deque = deque()
+                for chunk in reader:
+                    pending.append(pool.submit(_transform, chunk))
+                    if len(pending) >= 2 * workers:  # bound chunks in flight
+                        write(*pending.popleft().result())
+                while pending:
+                    write(*pending.popleft().result())
+    finally:
+        writer.close()
+        if csv_writer:
+            csv_writer.close()
+    return totals
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--enrollments", type=Path, default=PROJECT_ROOT / "fake_user_course_enrollments.csv")
+    ap.add_argument("--users", type=Path, default=PROJECT_ROOT / "fake_users.csv")
+    ap.add_argument("--courses", type=Path, default=PROJECT_ROOT / "online_courses_cleaned_trimmed.csv")
+    ap.add_argument("--profiles", type=Path, help="CSV with UserID, Tools Used, Interest, Goal")
+    ap.add_argument("--out", type=Path, default=PROJECT_ROOT / "fake_realistic_cleaned.parquet")
+    ap.add_argument("--csv", type=Path, help="also write the rows as CSV")
+    ap.add_argument("--chunksize", type=int, default=200_000)
+    ap.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    args = ap.parse_args(argv)
+
+    totals = build(args.enrollments, args.users, args.courses, args.out,
+                   csv_out=args.csv, profiles=args.profiles,
+                   chunksize=args.chunksize, workers=args.workers)
+    print(", ".join(f"{k}={v}" for k, v in totals.items()))
+    print(f"Wrote {args.out}" + (f" and {args.csv}" if args.csv else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import csv
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from MLApp.models import Course
+from MLApp.search import optimize_index
+
+# CSV header -> Course field
+COLUMN_MAP = {
+    "Title": "title",
+    "URL": "url",
+    "Short Intro": "short_intro",
+    "Category": "category",
+    "Sub-Category": "sub_category",
+    "Course Type": "course_type",
+    "Language": "language",
+    "Subtitle Languages": "subtitle_languages",
+    "Skills": "skills",
+    "Instructors": "instructors",
+    "Duration": "duration",
+    "Site": "site",
+}
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_rating(value):
+    """'4.9stars' -> 4.9"""
+    m = _NUMBER_RE.search(value or "")
+    return float(m.group()) if m else None
+
+
+def parse_viewers(value):
+    """'10,438 ' -> 10438"""
+    digits = (value or "").replace(",", "").strip()
+    return int(digits) if digits.isdigit() else None
+
+
+def course_key(url, title):
+    """Identity of a catalog row: its URL, or the title when there is none."""
+    return url or f"title:{title}"
+
+
+class Command(BaseCommand):
+    help = ("Load the course catalog CSV into MLApp_course (FTS index is kept in sync by triggers). "
+            "Courses whose URL is already stored, or repeated in the file, are skipped.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=str(Path(settings.BASE_DIR) / "online_courses_cleaned_trimmed.csv"),
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--replace", action="store_true", help="Delete existing courses first")
+
+    def handle(self, *args, **opts):
+        path = Path(opts["file"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        batch_size = opts["batch_size"]
+        total = skipped = 0
+        with transaction.atomic():
+            if opts["replace"]:
+                Course.objects.all().delete()
+            seen = {course_key(url, title) for url, title in Course.objects.values_list("url", "title")}
+
+            batch = []
+            with path.open(newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    fields = {dst: (row.get(src) or "").strip() for src, dst in COLUMN_MAP.items()}
+                    if not fields["title"]:
+                        continue
+                    key = course_key(fields["url"], fields["title"])
+                    if key in seen:
+                        skipped += 1
+                        continue
+                    seen.add(key)
+                    fields["rating"] = parse_rating(row.get("Rating"))
+                    fields["viewers"] = parse_viewers(row.get("Number of viewers"))
+                    batch.append(Course(**fields))
+                    if len(batch) >= batch_size:
+                        Course.objects.bulk_create(batch)
+                        total += len(batch)
+                        batch = []
+            if batch:
+                Course.objects.bulk_create(batch)
+                total += len(batch)
+
+        optimize_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {total} courses from {path.name} ({skipped} already present or repeated)"))
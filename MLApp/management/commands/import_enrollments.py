@@ -0,0 +1,54 @@
+import csv
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from MLApp.models import Enrollment
+from MLApp.rollups import record_enrollments
+
+
+class Command(BaseCommand):
+    help = ("Append enrollments from online_course_enrollments.csv and update the "
+            "rollups incrementally. Already imported Enrollment IDs are skipped.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=str(Path(settings.BASE_DIR) / "online_course_enrollments.csv"),
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        path = Path(opts["file"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        batch_size = opts["batch_size"]
+        added = seen = invalid = 0
+        batch = []
+        with path.open(newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                seen += 1
+                try:
+                    batch.append(Enrollment(
+                        enrollment_id=int(row["Enrollment ID"]),
+                        user_id=int(row["User ID"]),
+                        course_name=row["Course Name"].strip(),
+                        user_level=row["User Level"].strip(),
+                        enrolled_on=date.fromisoformat(row["Enrollment Date"].strip()),
+                    ))
+                except (KeyError, ValueError) as e:
+                    self.stderr.write(f"Skipping line {seen + 1}: {e}")
+                    invalid += 1
+                    continue
+                if len(batch) >= batch_size:
+                    added += record_enrollments(batch)
+                    batch = []
+        if batch:
+            added += record_enrollments(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Added {added} of {seen} enrollments from {path.name} "
+            f"({seen - invalid - added} already imported or repeated, {invalid} invalid)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from MLApp.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute all enrollment rollups from scratch (normally maintained incrementally)."
+
+    def handle(self, *args, **opts):
+        n = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {n} rollup buckets"))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Course',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500)),
+                ('url', models.URLField(blank=True, max_length=1000)),
+                ('short_intro', models.TextField(blank=True)),
+                ('category', models.CharField(blank=True, db_index=True, max_length=200)),
+                ('sub_category', models.CharField(blank=True, max_length=200)),
+                ('course_type', models.CharField(blank=True, max_length=100)),
+                ('language', models.CharField(blank=True, max_length=100)),
+                ('subtitle_languages', models.TextField(blank=True)),
+                ('skills', models.TextField(blank=True)),
+                ('instructors', models.TextField(blank=True)),
+                ('rating', models.FloatField(blank=True, null=True)),
+                ('viewers', models.PositiveIntegerField(blank=True, null=True)),
+                ('duration', models.CharField(blank=True, max_length=200)),
+                ('site', models.CharField(blank=True, db_index=True, max_length=100)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.db import migrations
+
+# External-content FTS5 index over the searchable Course columns. The
+# triggers keep it in sync with MLApp_course, and the persistent ``rank``
+# config makes ``ORDER BY rank`` use weighted bm25 (title > skills > intro
+# > category) without repeating the weights in every query.
+FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE mlapp_course_fts USING fts5(
+        title, short_intro, skills, category,
+        content='MLApp_course', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER mlapp_course_fts_ai AFTER INSERT ON MLApp_course BEGIN
+        INSERT INTO mlapp_course_fts(rowid, title, short_intro, skills, category)
+        VALUES (new.id, new.title, new.short_intro, new.skills, new.category);
+    END
+    """,
+    """
+    CREATE TRIGGER mlapp_course_fts_ad AFTER DELETE ON MLApp_course BEGIN
+        INSERT INTO mlapp_course_fts(mlapp_course_fts, rowid, title, short_intro, skills, category)
+        VALUES ('delete', old.id, old.title, old.short_intro, old.skills, old.category);
+    END
+    """,
+    """
+    CREATE TRIGGER mlapp_course_fts_au
+    AFTER UPDATE OF title, short_intro, skills, category ON MLApp_course BEGIN
+        INSERT INTO mlapp_course_fts(mlapp_course_fts, rowid, title, short_intro, skills, category)
+        VALUES ('delete', old.id, old.title, old.short_intro, old.skills, old.category);
+        INSERT INTO mlapp_course_fts(rowid, title, short_intro, skills, category)
+        VALUES (new.id, new.title, new.short_intro, new.skills, new.category);
+    END
+    """,
+    "INSERT INTO mlapp_course_fts(mlapp_course_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 5.0, 1.0)')",
+    "INSERT INTO mlapp_course_fts(mlapp_course_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS mlapp_course_fts_au",
+    "DROP TRIGGER IF EXISTS mlapp_course_fts_ad",
+    "DROP TRIGGER IF EXISTS mlapp_course_fts_ai",
+    "DROP TABLE IF EXISTS mlapp_course_fts",
+]
+
+
+def _run(statements):
+    def apply(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MLApp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(FTS_SQL), _run(DROP_SQL)),
+    ]
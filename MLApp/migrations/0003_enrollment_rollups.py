@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MLApp', '0002_course_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Enrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enrollment_id', models.PositiveIntegerField(unique=True)),
+                ('user_id', models.PositiveIntegerField()),
+                ('course_name', models.CharField(max_length=200)),
+                ('user_level', models.CharField(max_length=50)),
+                ('enrolled_on', models.DateField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='EnrollmentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('month', 'Month')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('course_name', models.CharField(max_length=200)),
+                ('user_level', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'course_name', 'period_start'], name='enroll_rollup_course_idx')],
+                'constraints': [models.UniqueConstraint(fields=('period', 'period_start', 'course_name', 'user_level'), name='uniq_enrollment_rollup_bucket')],
+            },
+        ),
+    ]
@@ -1,3 +1,72 @@
 from django.db import models
 
-# Create your models here.
+
+class Course(models.Model):
+    """One row of the course catalog (online_courses_cleaned_trimmed.csv)."""
+
+    title = models.CharField(max_length=500)
+    url = models.URLField(max_length=1000, blank=True)
+    short_intro = models.TextField(blank=True)
+    category = models.CharField(max_length=200, blank=True, db_index=True)
+    sub_category = models.CharField(max_length=200, blank=True)
+    course_type = models.CharField(max_length=100, blank=True)
+    language = models.CharField(max_length=100, blank=True)
+    subtitle_languages = models.TextField(blank=True)
+    skills = models.TextField(blank=True)
+    instructors = models.TextField(blank=True)
+    rating = models.FloatField(null=True, blank=True)
+    viewers = models.PositiveIntegerField(null=True, blank=True)
+    duration = models.CharField(max_length=200, blank=True)
+    site = models.CharField(max_length=100, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return self.title
+
+
+class Enrollment(models.Model):
+    """One row of online_course_enrollments.csv."""
+
+    enrollment_id = models.PositiveIntegerField(unique=True)
+    user_id = models.PositiveIntegerField()
+    course_name = models.CharField(max_length=200)
+    user_level = models.CharField(max_length=50)
+    enrolled_on = models.DateField(db_index=True)
+
+    def __str__(self):
+        return f"#{self.enrollment_id} {self.course_name} ({self.user_level})"
+
+
+class EnrollmentRollup(models.Model):
+    """
+    Materialized enrollment counts per (period bucket, course, level).
+
+    Maintained incrementally by MLApp.rollups; never written directly.
+    """
+
+    DAY = "day"
+    MONTH = "month"
+    PERIOD_CHOICES = [(DAY, "Day"), (MONTH, "Month")]
+
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    course_name = models.CharField(max_length=200)
+    user_level = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "period_start", "course_name", "user_level"],
+                name="uniq_enrollment_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["period", "course_name", "period_start"],
+                         name="enroll_rollup_course_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.period_start} {self.course_name} {self.user_level}: {self.count}"
@@ -0,0 +1,101 @@
+"""
+Incrementally maintained enrollment rollups (MLApp_enrollmentrollup).
+
+Every enrollment contributes +1 to one ``day`` bucket and one ``month``
+bucket for its (course, level). New enrollments are folded in as deltas
+with an ``INSERT ... ON CONFLICT DO UPDATE SET count = count + ?`` upsert,
+so the cost of an update is proportional to the number of buckets touched,
+not to the size of the enrollment history. ``rebuild_rollups`` is only
+needed after manual edits to the raw table.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import date
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDay, TruncMonth
+
+from .models import Enrollment, EnrollmentRollup
+
+ROLLUP_TABLE = EnrollmentRollup._meta.db_table
+
+_UPSERT_SQL = (
+    f"INSERT INTO {ROLLUP_TABLE} (period, period_start, course_name, user_level, count) "
+    "VALUES (%s, %s, %s, %s, %s) "
+    "ON CONFLICT (period, period_start, course_name, user_level) "
+    "DO UPDATE SET count = count + excluded.count"
+)
+
+
+def bucket_keys(enrolled_on: date, course_name: str, user_level: str) -> list[tuple]:
+    """The rollup buckets a single enrollment belongs to."""
+    return [
+        (EnrollmentRollup.DAY, enrolled_on, course_name, user_level),
+        (EnrollmentRollup.MONTH, enrolled_on.replace(day=1), course_name, user_level),
+    ]
+
+
+def apply_deltas(deltas: Counter) -> None:
+    """Add ``deltas`` (bucket key -> +/- count) onto the stored rollups."""
+    params = [(*key, n) for key, n in deltas.items() if n]
+    if not params:
+        return
+    with connection.cursor() as cur:
+        cur.executemany(_UPSERT_SQL, params)
+
+
+def deltas_for(enrollments: Iterable[Enrollment], sign: int = 1) -> Counter:
+    deltas: Counter = Counter()
+    for e in enrollments:
+        for key in bucket_keys(e.enrolled_on, e.course_name, e.user_level):
+            deltas[key] += sign
+    return deltas
+
+
+def record_enrollments(enrollments: list[Enrollment], batch_size: int = 1000) -> int:
+    """
+    Insert new enrollments and fold them into the rollups in one transaction.
+
+    Rows whose ``enrollment_id`` already exists, or repeats an earlier row of
+    the batch, are skipped, so re-running an import over the same file is a
+    no-op. Returns the number of rows added.
+    """
+    ids = [e.enrollment_id for e in enrollments]
+    seen = set(
+        Enrollment.objects.filter(enrollment_id__in=ids).values_list("enrollment_id", flat=True)
+    )
+    new = []
+    for e in enrollments:
+        if e.enrollment_id not in seen:
+            seen.add(e.enrollment_id)
+            new.append(e)
+    if not new:
+        return 0
+    with transaction.atomic():
+        Enrollment.objects.bulk_create(new, batch_size=batch_size)
+        apply_deltas(deltas_for(new))
+    return len(new)
+
+
+def rebuild_rollups() -> int:
+    """Recompute every rollup from MLApp_enrollment. Returns the bucket count."""
+    rows = []
+    for period, trunc in ((EnrollmentRollup.DAY, TruncDay), (EnrollmentRollup.MONTH, TruncMonth)):
+        agg = (Enrollment.objects
+               .annotate(period_start=trunc("enrolled_on"))
+               .values("period_start", "course_name", "user_level")
+               .annotate(n=Count("id")))
+        rows += [
+            EnrollmentRollup(period=period, period_start=a["period_start"],
+                             course_name=a["course_name"], user_level=a["user_level"],
+                             count=a["n"])
+            for a in agg
+        ]
+    with transaction.atomic():
+        EnrollmentRollup.objects.all().delete()
+        EnrollmentRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
@@ -0,0 +1,165 @@
+"""
+Full-text course search over the SQLite FTS5 index (mlapp_course_fts).
+
+Queries run entirely inside SQLite: the FTS index narrows the candidate set
+and ``ORDER BY rank`` returns them by weighted bm25, so only ``limit`` rows
+ever reach Python regardless of catalog size.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from django.db import connection
+
+FTS_TABLE = "mlapp_course_fts"
+COURSE_TABLE = "MLApp_course"
+
+RESULT_COLUMNS = ("id", "title", "url", "site", "category", "sub_category",
+                  "course_type", "rating", "viewers", "duration")
+
+FACET_COLUMNS = ("site", "category", "course_type")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match(text: str, operator: str = "AND", max_terms: Optional[int] = None) -> str:
+    """
+    Turn free user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term (``"pyth"*``), so FTS5 syntax
+    characters in the input can never produce a query error.
+    """
+    terms = list(dict.fromkeys(_TOKEN_RE.findall((text or "").lower())))
+    if max_terms is not None:
+        terms = terms[:max_terms]
+    return f" {operator} ".join(f'"{t}"*' for t in terms)
+
+
+def _filters(site: Optional[str], category: Optional[str]) -> tuple[list[str], list]:
+    sql, params = [], []
+    if site:
+        sql.append("AND c.site = %s")
+        params.append(site)
+    if category:
+        sql.append("AND c.category = %s")
+        params.append(category)
+    return sql, params
+
+
+def _fetch(sql: list[str], params: list, columns: tuple) -> list[dict]:
+    with connection.cursor() as cur:
+        cur.execute("\n".join(sql), params)
+        rows = cur.fetchall()
+    return [dict(zip(columns, r)) for r in rows]
+
+
+def search_courses(query: str,
+                   *,
+                   site: Optional[str] = None,
+                   category: Optional[str] = None,
+                   limit: int = 20,
+                   operator: str = "AND",
+                   after: Optional[tuple[float, int]] = None) -> list[dict]:
+    """
+    Return up to ``limit`` courses matching ``query``, best bm25 first.
+
+    ``after`` is the ``(rank, id)`` of the last row of the previous page;
+    passing it continues the listing from there (keyset pagination), so
+    deep pages cost the same as the first one.
+    """
+    match = build_match(query, operator)
+    if not match:
+        return []
+
+    cols = ", ".join(f"c.{c}" for c in RESULT_COLUMNS)
+    sql = [
+        f"SELECT {cols}, f.rank FROM {FTS_TABLE} f",
+        f"JOIN {COURSE_TABLE} c ON c.id = f.rowid",
+        f"WHERE {FTS_TABLE} MATCH %s",
+    ]
+    params: list = [match]
+    extra_sql, extra_params = _filters(site, category)
+    sql += extra_sql
+    params += extra_params
+    if after is not None:
+        sql.append("AND (f.rank, c.id) > (%s, %s)")
+        params += [float(after[0]), int(after[1])]
+    sql.append("ORDER BY f.rank, c.id LIMIT %s")
+    params.append(int(limit))
+    return _fetch(sql, params, RESULT_COLUMNS + ("rank",))
+
+
+def browse_courses(*,
+                   site: Optional[str] = None,
+                   category: Optional[str] = None,
+                   limit: int = 20,
+                   after_id: Optional[int] = None) -> list[dict]:
+    """List courses in id order without a text query (keyset on ``id``)."""
+    cols = ", ".join(f"c.{c}" for c in RESULT_COLUMNS)
+    extra_sql, params = _filters(site, category)
+    sql = [f"SELECT {cols} FROM {COURSE_TABLE} c WHERE 1 = 1"] + extra_sql
+    if after_id is not None:
+        sql.append("AND c.id > %s")
+        params.append(int(after_id))
+    sql.append("ORDER BY c.id LIMIT %s")
+    params.append(int(limit))
+    return _fetch(sql, params, RESULT_COLUMNS)
+
+
+def facet_counts(query: str = "", *, limit: int = 20) -> dict[str, list[dict]]:
+    """Course counts per site / category / type, for ``query`` or the whole catalog."""
+    match = build_match(query)
+    out: dict[str, list[dict]] = {}
+    for col in FACET_COLUMNS:
+        if match:
+            sql = [
+                f"SELECT c.{col}, COUNT(*) FROM {FTS_TABLE} f",
+                f"JOIN {COURSE_TABLE} c ON c.id = f.rowid",
+                f"WHERE {FTS_TABLE} MATCH %s",
+            ]
+            params: list = [match]
+        else:
+            sql, params = [f"SELECT c.{col}, COUNT(*) FROM {COURSE_TABLE} c WHERE 1 = 1"], []
+        sql.append(f"AND c.{col} != '' GROUP BY c.{col} ORDER BY 2 DESC, 1 LIMIT %s")
+        params.append(int(limit))
+        out[col] = _fetch(sql, params, ("value", "count"))
+    return out
+
+
+def recommend_courses(course_id: int, *, limit: int = 10) -> Optional[list[dict]]:
+    """
+    Courses similar to ``course_id``: an OR query over its title and skills,
+    ranked by bm25, excluding the course itself and same-title duplicates.
+    Returns None when there is no such course.
+    """
+    with connection.cursor() as cur:
+        cur.execute(f"SELECT title, skills FROM {COURSE_TABLE} WHERE id = %s", [int(course_id)])
+        row = cur.fetchone()
+    if row is None:
+        return None
+    title, skills = row
+    match = build_match(f"{title} {skills}", "OR", max_terms=32)
+    if not match:
+        return []
+
+    cols = ", ".join(f"c.{c}" for c in RESULT_COLUMNS)
+    sql = [
+        f"SELECT {cols}, f.rank FROM {FTS_TABLE} f",
+        f"JOIN {COURSE_TABLE} c ON c.id = f.rowid",
+        f"WHERE {FTS_TABLE} MATCH %s AND c.id != %s AND c.title != %s",
+        "ORDER BY f.rank, c.id LIMIT %s",
+    ]
+    return _fetch(sql, [match, int(course_id), title, int(limit)], RESULT_COLUMNS + ("rank",))
+
+
+def rebuild_index() -> None:
+    """Re-derive the FTS index from MLApp_course (after bulk loads or repairs)."""
+    with connection.cursor() as cur:
+        cur.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def optimize_index() -> None:
+    """Merge FTS5 b-tree segments; worth running once after a large import."""
+    with connection.cursor() as cur:
+        cur.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
@@ -0,0 +1,35 @@
+"""Keep enrollment rollups in step with single-row saves, edits and deletes."""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Enrollment
+from .rollups import apply_deltas, deltas_for
+
+
+@receiver(pre_save, sender=Enrollment)
+def enrollment_saving(sender, instance, raw=False, **kwargs):
+    # remember the stored bucket fields so an edit can move the count
+    instance._rollup_old = None
+    if instance.pk and not raw:
+        instance._rollup_old = (Enrollment.objects
+                                .only("course_name", "user_level", "enrolled_on")
+                                .filter(pk=instance.pk).first())
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_saved(sender, instance, created, raw=False, **kwargs):
+    # bulk_create (used by record_enrollments) sends no signals, so this only
+    # sees rows saved one at a time, e.g. through the admin.
+    if raw:
+        return
+    deltas = deltas_for([instance])
+    old = getattr(instance, "_rollup_old", None)
+    if old is not None:
+        deltas.update(deltas_for([old], sign=-1))  # update() keeps negative counts
+    apply_deltas(deltas)
+    instance._rollup_old = None
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    apply_deltas(deltas_for([instance], sign=-1))
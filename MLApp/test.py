@@ -157,7 +157,8 @@ def export_words_to_excel(top_words, file_name="en_sik_kelimeler.xlsx"):
 
 
 # Ana akış
-save_education_programs("egitim_programlari.txt")
-top_words = analyze_top_words("egitim_programlari.txt")
-plot_word_frequencies(top_words)
-export_words_to_excel(top_words)
+if __name__ == "__main__":
+    save_education_programs("egitim_programlari.txt")
+    top_words = analyze_top_words("egitim_programlari.txt")
+    plot_word_frequencies(top_words)
+    export_words_to_excel(top_words)
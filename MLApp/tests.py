@@ -1,3 +1,390 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import orjson
+import pyarrow.parquet as pq
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from . import etl
+from .models import Course, Enrollment, EnrollmentRollup
+from .rollups import rebuild_rollups, record_enrollments
+from .utils.chat_store import ChatStore
+
+
+def _rollup_snapshot():
+    return sorted(
+        EnrollmentRollup.objects.filter(count__gt=0)
+        .values_list("period", "period_start", "course_name", "user_level", "count")
+    )
+
+
+class RollupInvariantTests(TestCase):
+    """Incremental rollup maintenance must end where a full rebuild does."""
+
+    def _write_csv(self, rows):
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", encoding="utf-8", delete=False)
+        self.addCleanup(Path(tmp.name).unlink)
+        with tmp:
+            w = csv.writer(tmp)
+            w.writerow(["Enrollment ID", "User ID", "Course Name", "User Level", "Enrollment Date"])
+            w.writerows(rows)
+        return tmp.name
+
+    def assertMatchesRebuild(self):
+        incremental = _rollup_snapshot()
+        rebuild_rollups()
+        self.assertEqual(incremental, _rollup_snapshot())
+
+    def test_import_save_edit_delete_matches_rebuild(self):
+        path = self._write_csv([
+            (1, 10, "Python Basics", "Beginner", "2020-03-10"),
+            (2, 11, "Python Basics", "Beginner", "2020-03-10"),
+            (3, 12, "Data Science", "Advanced", "2020-03-31"),
+            (4, 13, "Data Science", "Intermediate", "2021-01-05"),
+            ("bad", 14, "Data Science", "Advanced", "2021-01-05"),
+        ])
+        call_command("import_enrollments", file=path, stdout=StringIO(), stderr=StringIO())
+        call_command("import_enrollments", file=path, stdout=StringIO(), stderr=StringIO())  # re-import is a no-op
+        self.assertEqual(Enrollment.objects.count(), 4)
+        self.assertEqual(
+            EnrollmentRollup.objects.get(period="day", period_start=date(2020, 3, 10),
+                                         course_name="Python Basics", user_level="Beginner").count,
+            2,
+        )
+
+        Enrollment.objects.create(enrollment_id=5, user_id=15, course_name="Web Development",
+                                  user_level="Beginner", enrolled_on=date(2020, 3, 11))
+
+        moved = Enrollment.objects.get(enrollment_id=2)
+        moved.course_name = "Data Science"
+        moved.user_level = "Advanced"
+        moved.enrolled_on = date(2020, 4, 2)
+        moved.save()
+
+        Enrollment.objects.get(enrollment_id=4).delete()
+
+        self.assertMatchesRebuild()
+
+    def test_repeated_ids_in_one_file_are_skipped(self):
+        path = self._write_csv([
+            (1, 10, "Python Basics", "Beginner", "2020-03-10"),
+            (1, 99, "Data Science", "Advanced", "2020-05-01"),
+            (2, 11, "Data Science", "Advanced", "2020-05-01"),
+            (2, 11, "Data Science", "Advanced", "2020-05-01"),
+        ])
+        out = StringIO()
+        call_command("import_enrollments", file=path, stdout=out, stderr=StringIO())
+        self.assertIn("Added 2 of 4", out.getvalue())
+        self.assertIn("2 already imported or repeated", out.getvalue())
+        self.assertEqual(Enrollment.objects.get(enrollment_id=1).course_name, "Python Basics")  # first row wins
+        self.assertEqual(sum(r[-1] for r in _rollup_snapshot() if r[0] == "day"), 2)
+        self.assertMatchesRebuild()
+
+    def test_save_without_changes_keeps_counts(self):
+        record_enrollments([Enrollment(enrollment_id=1, user_id=1, course_name="Python Basics",
+                                       user_level="Beginner", enrolled_on=date(2022, 6, 1))])
+        e = Enrollment.objects.get(enrollment_id=1)
+        e.user_id = 2
+        e.save()
+        self.assertEqual([r[-1] for r in _rollup_snapshot()], [1, 1])
+        self.assertMatchesRebuild()
+
+
+def _cursor(values):
+    return base64.urlsafe_b64encode(orjson.dumps(values)).rstrip(b"=").decode("ascii")
+
+
+class CourseApiPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        sites = ["Coursera", "Udacity", "Future Learn"]
+        for i in range(23):
+            Course.objects.create(
+                title=f"Python course {i}" + (" python python" if i % 4 == 0 else ""),
+                short_intro="Learn python" if i % 2 else "Learn programming",
+                skills="python" if i % 3 else "",
+                site=sites[i % len(sites)],
+            )
+        for i in range(5):
+            Course.objects.create(title=f"Watercolour painting {i}", site="Coursera")
+
+    def _pages(self, params, limit=5):
+        seen, cursor = [], None
+        for _ in range(50):
+            query = dict(params, limit=limit)
+            if cursor:
+                query["cursor"] = cursor
+            resp = self.client.get("/api/courses/", query)
+            self.assertEqual(resp.status_code, 200)
+            data = resp.json()
+            self.assertLessEqual(len(data["results"]), limit)
+            seen.append(data["results"])
+            cursor = data["next"]
+            if not cursor:
+                return seen
+        self.fail("pagination did not terminate")
+
+    def test_search_pages_cover_all_matches_once_in_rank_order(self):
+        rows = [r for page in self._pages({"q": "python"}) for r in page]
+        ids = [r["id"] for r in rows]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(set(ids), set(Course.objects.filter(title__startswith="Python").values_list("id", flat=True)))
+        keys = [(r["rank"], r["id"]) for r in rows]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_search_pages_respect_filters(self):
+        rows = [r for page in self._pages({"q": "python", "site": "Udacity"}, limit=3) for r in page]
+        self.assertTrue(rows)
+        self.assertTrue(all(r["site"] == "Udacity" for r in rows))
+        self.assertEqual(len(rows), Course.objects.filter(title__startswith="Python", site="Udacity").count())
+
+    def test_browse_pages_cover_catalog_in_id_order(self):
+        ids = [r["id"] for page in self._pages({}, limit=6) for r in page]
+        self.assertEqual(ids, list(Course.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_invalid_cursors_are_rejected(self):
+        search_cursors = ["not base64!", _cursor([1.0, 1e300]), _cursor([True, 1]), _cursor([1.0, True]),
+                          _cursor([1.0, 1.5]), _cursor([1.0, 2 ** 63]), _cursor([1.0]), _cursor({"a": 1}),
+                          base64.urlsafe_b64encode(b"[1.0, NaN]").decode()]
+        for cursor in search_cursors:
+            with self.subTest(cursor=cursor):
+                resp = self.client.get("/api/courses/", {"q": "python", "cursor": cursor})
+                self.assertEqual(resp.status_code, 400)
+
+        for cursor in [_cursor([True]), _cursor([1.5]), _cursor([2 ** 63]), _cursor([1, 2]), _cursor([])]:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get("/api/courses/", {"cursor": cursor}).status_code, 400)
+
+    def test_etag_revalidation(self):
+        resp = self.client.get("/api/courses/", {"q": "watercolour"})
+        self.assertEqual(resp.status_code, 200)
+        again = self.client.get("/api/courses/", {"q": "watercolour"}, HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_recommendations_for_unknown_course_are_404(self):
+        course = Course.objects.get(title="Python course 1")
+        resp = self.client.get(f"/api/courses/{course.id}/recommendations/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.json()["results"])
+        for course_id in (999999, 2 ** 63):
+            with self.subTest(course_id=course_id):
+                resp = self.client.get(f"/api/courses/{course_id}/recommendations/")
+                self.assertEqual(resp.status_code, 404)
+                self.assertNotIn("public", resp.get("Cache-Control", ""))
+
+
+class HistoryTransportTests(SimpleTestCase):
+    """ui's delta history protocol and the bounded history it falls back to."""
+
+    def _run_turns(self, echo: bool, turns: int = 3) -> list[dict]:
+        import ui
+        from websockets.asyncio.server import serve
+
+        received = []
+
+        async def handler(ws):
+            req = json.loads(await ws.recv())
+            received.append(req)
+            await ws.send(json.dumps({"text": f"cevap {len(received)}"}))
+            await ws.send(json.dumps({"done": True, "session_len": req.get("session_len")} if echo else {"done": True}))
+
+        async def main():
+            async with serve(handler, "127.0.0.1", 0) as server:
+                port = server.sockets[0].getsockname()[1]
+                env = {"KURSBUL_API_BASE": f"ws://127.0.0.1:{port}", "KURSBUL_HISTORY_MODE": "delta"}
+                with mock.patch.dict(os.environ, env):
+                    sid, history = uuid.uuid4().hex, []
+                    for turn in range(turns):
+                        prompt = f"soru {turn}"
+                        history.append((prompt, await ui.call_backend_ws(prompt, history, "sistem", sid)))
+
+        asyncio.run(main())
+        return received
+
+    def test_deltas_start_after_the_server_echoes_session_len(self):
+        first, *rest = self._run_turns(echo=True)
+        self.assertEqual(first["base"], 0)
+        self.assertEqual([m["content"] for m in first["messages"]], ["sistem"])
+        for turn, req in enumerate(rest, start=1):
+            self.assertEqual(req["base"], 2 * turn - 1)
+            self.assertEqual(req["session_len"], 2 * turn + 1)
+            self.assertEqual([m["content"] for m in req["messages"]], [f"soru {turn - 1}", f"cevap {turn}"])
+
+    def test_server_without_echo_keeps_getting_full_history(self):
+        for turn, req in enumerate(self._run_turns(echo=False)):
+            self.assertEqual(req["base"], 0)
+            self.assertEqual(len(req["messages"]), 2 * turn + 1)
+
+    def test_bound_messages_counts_the_summary_note(self):
+        from ui import _bound_messages
+
+        msgs = [{"role": "system", "content": "sistem"}]
+        for i in range(30):
+            msgs += [{"role": "user", "content": f"soru {i} " + "x" * 40},
+                     {"role": "assistant", "content": f"cevap {i} " + "y" * 150}]
+        for max_chars in (10, 120, 300, 1000, 5000):
+            with self.subTest(max_chars=max_chars):
+                out = _bound_messages(msgs, max_chars)
+                self.assertEqual(out[0], msgs[0])
+                self.assertLessEqual(sum(len(m["content"]) for m in out[1:]), max_chars)
+                self.assertTrue(out[-1]["content"].endswith(msgs[-1]["content"][-5:]))
+        self.assertIn("Kullanıcının önceki soruları", _bound_messages(msgs, 1000)[1]["content"])
+        self.assertEqual(_bound_messages(msgs[:3], 5000), msgs[:3])
+
+
+class ChatStoreTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def test_append_history_export_round_trip(self):
+        store = ChatStore(self.root)
+        turns = [("Merhaba", "Selam!"), ("Python kursu?", 'Şunlar var: "Python 101"\n- ...')]
+        for user, assistant in turns:
+            store.append("s1", user, assistant)
+        self.assertEqual(store.history("s1"), turns)
+        self.assertEqual(ChatStore(self.root).history("s1"), turns)  # reloaded from disk
+        out = self.root / "export.json"
+        self.assertEqual(store.export("s1", out), 2)
+        self.assertEqual(json.loads(out.read_text(encoding="utf-8")),
+                         [{"user": u, "assistant": a} for u, a in turns])
+        with self.assertRaises(ValueError):
+            store.append("../etc", "x", "y")
+
+    def test_lru_keeps_max_hot_sessions(self):
+        store = ChatStore(self.root, max_hot=2)
+        for sid in ("a", "b", "c"):
+            store.append(sid, "soru", sid)
+            store.history(sid)
+        self.assertEqual((store.hits, store.misses), (0, 3))
+        self.assertEqual(store.history("c"), [("soru", "c")])
+        self.assertEqual(store.history("a"), [("soru", "a")])  # evicted, read back from disk
+        self.assertEqual((store.hits, store.misses), (1, 4))
+
+    def test_delete_removes_file_and_hot_copy(self):
+        store = ChatStore(self.root)
+        store.append("s1", "soru", "cevap")
+        store.history("s1")
+        store.delete("s1")
+        self.assertFalse(store.path("s1").exists())
+        self.assertEqual(store.history("s1"), [])
+        store.delete("never-existed")
+
+    def test_sweep_removes_only_expired_sessions(self):
+        store = ChatStore(self.root)
+        for sid in ("old", "new"):
+            store.append(sid, "soru", "cevap")
+            store.history(sid)
+        past = time.time() - 7200
+        os.utime(store.path("old"), (past, past))
+        self.assertEqual(store.sweep(), 0)  # no retention configured
+        self.assertEqual(store.sweep(retention=3600), 1)
+        self.assertFalse(store.path("old").exists())
+        self.assertEqual(store.history("old"), [])
+        self.assertEqual(store.history("new"), [("soru", "cevap")])
+
+    def test_sweep_thread_expires_sessions(self):
+        ChatStore(self.root).append("old", "soru", "cevap")
+        past = time.time() - 7200
+        os.utime(self.root / "old.jsonl", (past, past))
+        store = ChatStore(self.root, retention=3600, sweep_interval=0.05)
+        self.addCleanup(store.close)
+        deadline = time.monotonic() + 5
+        while (self.root / "old.jsonl").exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse((self.root / "old.jsonl").exists())
+        store.append("new", "soru", "cevap")
+        self.assertTrue(store.path("new").exists())
+
+    def test_append_during_disk_load_is_not_lost(self):
+        ChatStore(self.root).append("s1", "u1", "a1")
+        store = ChatStore(self.root)
+        loading, release = threading.Event(), threading.Event()
+        read_from_disk = store.iter_turns
+
+        def slow_iter_turns(session_id):
+            turns = list(read_from_disk(session_id))
+            loading.set()
+            release.wait(5)
+            yield from turns
+
+        with mock.patch.object(store, "iter_turns", slow_iter_turns):
+            reader = threading.Thread(target=store.history, args=("s1",))
+            reader.start()
+            self.assertTrue(loading.wait(5))
+            writer = threading.Thread(target=store.append, args=("s1", "u2", "a2"))
+            writer.start()
+            writer.join(0.2)
+            self.assertTrue(writer.is_alive())  # waits for the load of the same session
+            release.set()
+            reader.join(5)
+            writer.join(5)
+        self.assertEqual(store.history("s1"), [("u1", "a1"), ("u2", "a2")])
+
+
+class EtlBuildTests(SimpleTestCase):
+    """etl.build in-process on tiny files, three enrollment rows per chunk."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        courses = ["Python for Everybody", "Data Science Basics", "Data Science Advanced", "Machine Learning"]
+        self._write("courses.csv", ["Title"] + etl.COURSE_COLUMNS,
+                    [[t] + [f"{c} of {t}" for c in etl.COURSE_COLUMNS] for t in courses])
+        self._write("users.csv", ["UserID", "Name", "ExperienceLevel"],
+                    [["U1", "Ayşe", "Beginner"], ["U2", "Mehmet", "Advanced"]])
+
+    def _write(self, name, header, rows):
+        with (self.dir / name).open("w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(header)
+            w.writerows(rows)
+        return self.dir / name
+
+    def _build(self, title_column):
+        enrollments = self._write("enrollments.csv", ["UserID", title_column], [
+            ["U1", "Python for Everybody"],
+            ["U1", "  python   FOR everybody "],   # same pair within the chunk
+            ["UserID", title_column],              # repeated header
+            ["U2", "Data Science Bas..."],         # unique prefix: Data Science Basics
+            ["U2", "Data Science..."],             # ambiguous prefix
+            ["U1", "Python for Everybody"],        # same pair, next chunk
+            ["U3", "Python for Everybody"],        # unknown user
+            ["", "Python for Everybody"],          # missing user id
+            ["U2", "data science basics"],         # same pair as the truncated title
+            ["U2", "Machine Learning"],
+            ["UserID", "Course Title"],            # repeated header
+        ])
+        out = self.dir / "out.parquet"
+        stats = etl.build(enrollments, self.dir / "users.csv", self.dir / "courses.csv", out,
+                          chunksize=3, workers=1)
+        return stats, pq.read_table(out).to_pylist()
+
+    def test_build_cleans_joins_and_dedupes(self):
+        for title_column in ("Course Title", "Title"):
+            with self.subTest(title_column=title_column):
+                stats, rows = self._build(title_column)
+                self.assertEqual(stats, {"read": 11, "header_rows": 2, "invalid": 1, "unmatched_course": 1,
+                                         "unmatched_user": 1, "duplicates": 3, "written": 3})
+                self.assertEqual([(r["UserID"], r["Course Title"], r["Proficiency"]) for r in rows], [
+                    ("U1", "Python for Everybody", "Beginner"),
+                    ("U2", "Data Science Basics", "Advanced"),
+                    ("U2", "Machine Learning", "Advanced"),
+                ])
+                self.assertEqual(rows[1]["URL"], "URL of Data Science Basics")
+                self.assertEqual(list(rows[0]), etl.OUTPUT_COLUMNS)
+                self.assertIsNone(rows[0]["Goal"])
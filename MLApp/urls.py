@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import views
+
+app_name = "mlapp"
+
+urlpatterns = [
+    path("courses/", views.course_search, name="course-search"),
+    path("courses/facets/", views.course_facets, name="course-facets"),
+    path("courses/<int:course_id>/recommendations/", views.course_recommendations,
+         name="course-recommendations"),
+]
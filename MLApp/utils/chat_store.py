@@ -0,0 +1,165 @@
+"""
+Server-side chat sessions: one append-only JSONL file per session id,
+plus an in-memory LRU of recently used sessions.
+
+Each turn is a single appended line, so saving is O(1) in the length of
+the chat, and exports stream the file line by line instead of holding the
+whole conversation in memory. Session files untouched for ``retention``
+seconds are deleted by a daemon thread that sweeps every
+``sweep_interval`` seconds, off the request path.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_STRIPES = 64
+
+log = logging.getLogger("app")
+
+
+class ChatStore:
+    def __init__(self, root: Path, max_hot: int = 256,
+                 retention: Optional[float] = None, sweep_interval: float = 3600.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_hot = max_hot
+        self.retention = retention
+        self.sweep_interval = sweep_interval
+        self._hot: "OrderedDict[str, List[Tuple[str, str]]]" = OrderedDict()
+        self._lock = threading.Lock()  # guards _hot and the counters
+        # per-session file locks (striped): a disk load and an append of the
+        # same session never interleave, other sessions are not blocked
+        self._file_locks = [threading.Lock() for _ in range(_STRIPES)]
+        self.hits = 0
+        self.misses = 0
+        self._stop = threading.Event()
+        self._sweeper = None
+        if retention is not None:
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="chat-store-sweep", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while True:
+            try:
+                removed = self.sweep()
+                if removed:
+                    log.info("Chat store sweep removed %d expired sessions", removed)
+            except OSError:
+                log.exception("Chat store sweep failed")
+            if self._stop.wait(self.sweep_interval):
+                return
+
+    def close(self) -> None:
+        """Stop the sweep thread (sessions stay on disk)."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+
+    def path(self, session_id: str) -> Path:
+        if not _SESSION_ID_RE.match(session_id or ""):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        return self.root / f"{session_id}.jsonl"
+
+    def _file_lock(self, session_id: str) -> threading.Lock:
+        return self._file_locks[hash(session_id) % _STRIPES]
+
+    def _touch(self, session_id: str, turns: List[Tuple[str, str]]) -> None:
+        self._hot[session_id] = turns
+        self._hot.move_to_end(session_id)
+        while len(self._hot) > self.max_hot:
+            self._hot.popitem(last=False)
+
+    def history(self, session_id: str) -> List[Tuple[str, str]]:
+        """All (user, assistant) turns of a session, oldest first."""
+        with self._lock:
+            turns = self._hot.get(session_id)
+            if turns is not None:
+                self.hits += 1
+                self._hot.move_to_end(session_id)
+                return list(turns)
+            self.misses += 1
+        with self._file_lock(session_id):
+            with self._lock:
+                turns = self._hot.get(session_id)  # loaded by another thread meanwhile
+            if turns is None:
+                turns = [(t["user"], t["assistant"]) for t in self.iter_turns(session_id)]
+            with self._lock:
+                self._touch(session_id, turns)
+                return list(turns)
+
+    def append(self, session_id: str, user: str, assistant: str) -> None:
+        """Persist one turn (a single JSONL line) and update the hot copy."""
+        line = json.dumps({"ts": time.time(), "user": user, "assistant": assistant}, ensure_ascii=False)
+        path = self.path(session_id)
+        with self._file_lock(session_id):
+            with path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            with self._lock:
+                turns = self._hot.get(session_id)
+                if turns is not None:
+                    turns.append((user, assistant))
+                    self._hot.move_to_end(session_id)
+
+    def delete(self, session_id: str) -> None:
+        """Forget a session: its file and its hot copy."""
+        path = self.path(session_id)
+        with self._file_lock(session_id):
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self._hot.pop(session_id, None)
+
+    def sweep(self, retention: Optional[float] = None) -> int:
+        """Delete sessions not written for ``retention`` seconds. Returns how many."""
+        retention = self.retention if retention is None else retention
+        if retention is None:
+            return 0
+        cutoff = time.time() - retention
+        removed = 0
+        for path in self.root.glob("*.jsonl"):
+            session_id = path.stem
+            with self._file_lock(session_id):
+                try:
+                    if path.stat().st_mtime >= cutoff:
+                        continue
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                with self._lock:
+                    self._hot.pop(session_id, None)
+            removed += 1
+        return removed
+
+    def iter_turns(self, session_id: str) -> Iterator[dict]:
+        """Stream the stored turns of a session from disk."""
+        path = self.path(session_id)
+        if not path.exists():
+            return
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+
+    def export(self, session_id: str, out_path: Path) -> int:
+        """Write the session as a JSON array to ``out_path`` without loading it whole. Returns turn count."""
+        n = 0
+        with Path(out_path).open("w", encoding="utf-8") as out:
+            out.write("[")
+            for turn in self.iter_turns(session_id):
+                item = {"user": turn.get("user", ""), "assistant": turn.get("assistant", "")}
+                out.write(("," if n else "") + "\n  " + json.dumps(item, ensure_ascii=False))
+                n += 1
+            out.write("\n]\n")
+        return n
@@ -1,6 +1,6 @@
 from pathlib import Path
-import logging, sys, warnings, faulthandler
-from logging.handlers import RotatingFileHandler
+import atexit, logging, os, queue, sys, warnings, faulthandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # logs/ under project root
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -9,11 +9,133 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / "app.log"
 CRASH_FILE = LOG_DIR / "crash.log"
 
+# request threads only enqueue; one listener thread writes to disk
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_QUEUE_POLICY = os.getenv("LOG_QUEUE_POLICY", "drop_new")  # drop_new | drop_oldest | block
+LOG_BATCH_SIZE = 256
+DROP_POLICIES = ("drop_new", "drop_oldest", "block")
+
 # capture hard crashes (segfaults, etc.)
 _crash_fp = open(CRASH_FILE, "a", buffering=1, encoding="utf-8")
 faulthandler.enable(_crash_fp)
 
-def setup_logging(level=logging.DEBUG):
+_queue_handler = None
+_listener = None
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue; what happens when it is full is the
+    drop policy. WARNING and above are never dropped: they wait for room.
+    """
+
+    def __init__(self, q, policy="drop_new"):
+        if policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown log drop policy {policy!r}, expected one of {DROP_POLICIES}")
+        super().__init__(q)
+        self.policy = policy
+        self.dropped = 0
+
+    def enqueue(self, record):
+        if self.policy == "block" or record.levelno >= logging.WARNING:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+
+class BatchRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that writes a whole batch with one write + flush."""
+
+    def emit_batch(self, records):
+        lines = []
+        for record in records:
+            if record.levelno < self.level or not self.filter(record):
+                continue
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        data = "".join(lines)
+        with self.lock:
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                pos = self.stream.tell()
+                if self.maxBytes > 0 and pos and pos + len(data) >= self.maxBytes:
+                    self.doRollover()
+                self.stream.write(data)
+                self.stream.flush()
+            except Exception:
+                self.handleError(records[-1])
+
+
+class BatchingQueueListener(QueueListener):
+    """Drains whatever is queued (up to batch_size) and hands it to the handlers at once."""
+
+    def __init__(self, q, *handlers, batch_size=LOG_BATCH_SIZE):
+        super().__init__(q, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def enqueue_sentinel(self):
+        # blocking put: on a full queue the sentinel must still get in
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stop = any(r is self._sentinel for r in batch)
+            records = [r for r in batch if r is not self._sentinel]
+            for h in self.handlers:
+                if hasattr(h, "emit_batch"):
+                    h.emit_batch(records)
+                else:
+                    for r in records:
+                        if r.levelno >= h.level:
+                            h.handle(r)
+            if has_task_done:
+                for _ in batch:
+                    q.task_done()
+            if stop:
+                break
+
+
+def setup_logging(level=None, queue_size=None, drop_policy=None):
+    """
+    Route all logging through a bounded queue to a background file writer.
+
+    level / queue_size / drop_policy default to LOG_LEVEL, LOG_QUEUE_SIZE
+    and LOG_QUEUE_POLICY from the environment.
+    """
+    global _queue_handler, _listener
+    shutdown_logging()
+
+    level = level if level is not None else LOG_LEVEL
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
     root = logging.getLogger()
     root.setLevel(level)
 
@@ -21,14 +143,19 @@ def setup_logging(level=logging.DEBUG):
     for h in list(root.handlers):
         root.removeHandler(h)
 
-    fh = RotatingFileHandler(
+    fh = BatchRotatingFileHandler(
         LOG_FILE, maxBytes=2_000_000, backupCount=5, encoding="utf-8"
     )
-    fh.setLevel(logging.DEBUG)
+    fh.setLevel(level)
     fh.setFormatter(logging.Formatter(
         "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
     ))
-    root.addHandler(fh)
+
+    q = queue.Queue(maxsize=queue_size if queue_size is not None else LOG_QUEUE_SIZE)
+    _queue_handler = BoundedQueueHandler(q, drop_policy or LOG_QUEUE_POLICY)
+    _listener = BatchingQueueListener(q, fh)
+    _listener.start()
+    root.addHandler(_queue_handler)
 
     # pipe warnings → logging
     logging.captureWarnings(True)
@@ -42,5 +169,26 @@ def setup_logging(level=logging.DEBUG):
 
     return root
 
+def shutdown_logging():
+    """Detach the queue handler and let the listener flush everything queued so far."""
+    global _queue_handler, _listener
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
+
+# runs before logging's own atexit hook (registered earlier), so queued records reach disk
+atexit.register(shutdown_logging)
+
+def log_queue_stats():
+    """Current queue depth and records dropped by the drop policy."""
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
+
 def get_logger(name="app"):
     return logging.getLogger(name)
@@ -0,0 +1,301 @@
+"""
+Tiny in-process metrics: per-stage latency histograms, counters and
+callback gauges, rendered as Prometheus text on demand.
+
+Recording is a dict lookup, a bisect over ~15 bucket bounds and a few
+integer increments under a lock, so spans can stay on the request path.
+Nothing is formatted or aggregated until someone scrapes. Set
+METRICS_ENABLED=0 to turn ``span``/``observe``/``inc`` into no-ops, or
+wrap non-user work (warm-up) in ``suppressed()`` to skip it per thread.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+PREFIX = "kursbul_"
+
+# seconds; the implicit last bucket is +Inf
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_histograms: dict[tuple, "Histogram"] = {}
+_counters: dict[tuple, "Counter"] = {}
+_gauges: dict[str, tuple[str, Callable[[], float]]] = {}
+_help: dict[str, str] = {}
+_local = threading.local()
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def _fmt_labels(labels: tuple, extra: tuple = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    body = ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in items)
+    return "{" + body + "}"
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile by linear interpolation inside its bucket."""
+        counts, _, total = self.snapshot()
+        if not total:
+            return None
+        rank = q * total
+        cum = 0
+        for i, n in enumerate(counts):
+            if cum + n >= rank and n:
+                if i == len(self.buckets):  # +Inf bucket: best we can say is "above the last bound"
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cum) / n
+            cum += n
+        return self.buckets[-1]
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n: int = 1) -> None:
+        with self._lock:
+            self.value += n
+
+
+def histogram(name: str, help: str = "", **labels) -> Histogram:
+    key = _key(name, labels)
+    h = _histograms.get(key)
+    if h is None:
+        with _lock:
+            h = _histograms.setdefault(key, Histogram())
+            if help:
+                _help.setdefault(name, help)
+    return h
+
+
+def counter(name: str, help: str = "", **labels) -> Counter:
+    key = _key(name, labels)
+    c = _counters.get(key)
+    if c is None:
+        with _lock:
+            c = _counters.setdefault(key, Counter())
+            if help:
+                _help.setdefault(name, help)
+    return c
+
+
+def gauge(name: str, fn: Callable[[], float], help: str = "") -> None:
+    """Register a gauge whose value is read from ``fn`` at scrape time."""
+    with _lock:
+        _gauges[name] = (help, fn)
+
+
+# ---------------------------------------------------------------------
+# Recording helpers
+# ---------------------------------------------------------------------
+
+def _recording() -> bool:
+    return METRICS_ENABLED and not getattr(_local, "suppressed", False)
+
+
+@contextmanager
+def suppressed():
+    """Record nothing from the current thread inside the block."""
+    prev = getattr(_local, "suppressed", False)
+    _local.suppressed = True
+    try:
+        yield
+    finally:
+        _local.suppressed = prev
+
+
+def observe(stage: str, seconds: float) -> None:
+    if _recording():
+        histogram("stage_seconds", "Latency of pipeline stages", stage=stage).observe(seconds)
+
+
+def inc(name: str, n: int = 1, **labels) -> None:
+    if _recording():
+        counter(name, **labels).inc(n)
+
+
+@contextmanager
+def span(stage: str):
+    """Time the enclosed block as ``stage``; exceptions also count as stage errors."""
+    if not _recording():
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        counter("stage_errors_total", "Stage failures", stage=stage).inc()
+        raise
+    finally:
+        observe(stage, time.perf_counter() - t0)
+
+
+def timed(stage: str):
+    """Decorator form of ``span``."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with span(stage):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+# ---------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------
+
+def _items(registry: dict) -> list:
+    with _lock:
+        return sorted(registry.items(), key=lambda kv: kv[0])
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format (v0.0.4)."""
+    lines: list[str] = []
+    seen: set[str] = set()
+
+    def header(name: str, kind: str):
+        full = PREFIX + name
+        if full in seen:
+            return
+        seen.add(full)
+        if _help.get(name):
+            lines.append(f"# HELP {full} {_help[name]}")
+        lines.append(f"# TYPE {full} {kind}")
+
+    for (name, labels), h in _items(_histograms):
+        header(name, "histogram")
+        counts, total_sum, total = h.snapshot()
+        cum = 0
+        for bound, n in zip(h.buckets + (float("inf"),), counts):
+            cum += n
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{PREFIX}{name}_bucket{_fmt_labels(labels, (('le', le),))} {cum}")
+        lines.append(f"{PREFIX}{name}_sum{_fmt_labels(labels)} {total_sum}")
+        lines.append(f"{PREFIX}{name}_count{_fmt_labels(labels)} {total}")
+
+    for (name, labels), c in _items(_counters):
+        header(name, "counter")
+        lines.append(f"{PREFIX}{name}{_fmt_labels(labels)} {c.value}")
+
+    for name, (help_, fn) in _items(_gauges):
+        try:
+            value = float(fn())
+        except Exception:
+            continue
+        _help.setdefault(name, help_)
+        header(name, "gauge")
+        lines.append(f"{PREFIX}{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def stage_summary() -> list[list]:
+    """Rows of [stage, count, errors, error %, p50 ms, p95 ms, p99 ms] for display."""
+    rows = []
+    for (name, labels), h in _items(_histograms):
+        if name != "stage_seconds":
+            continue
+        stage = dict(labels).get("stage", "")
+        errors = _counters.get(_key("stage_errors_total", {"stage": stage}))
+        n_err = errors.value if errors else 0
+        ms = [h.quantile(q) for q in (0.5, 0.95, 0.99)]
+        rows.append([
+            stage, h.count, n_err,
+            round(100.0 * n_err / h.count, 2) if h.count else 0.0,
+            *[round(v * 1000, 2) if v is not None else None for v in ms],
+        ])
+    return rows
+
+
+def cache_summary() -> dict[str, float]:
+    """Hit rate per cache name, 0..1."""
+    hits: dict[str, list[int]] = {}
+    for (name, labels), c in _items(_counters):
+        if name != "cache_requests_total":
+            continue
+        d = dict(labels)
+        slot = hits.setdefault(d.get("cache", ""), [0, 0])
+        slot[0 if d.get("result") == "hit" else 1] += c.value
+    return {k: h / (h + m) for k, (h, m) in hits.items() if h + m}
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    ready: Optional[Callable[[], bool]] = None
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/ready":
+            ok = self.ready is None or self.ready()
+            self._send(200 if ok else 503, b"ready\n" if ok else b"warming up\n", "text/plain; charset=utf-8")
+        elif path == "/metrics":
+            self._send(200, render_prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # keep scrapes out of the app log
+        pass
+
+
+def start_http_server(port: int, host: str = "127.0.0.1",
+                      ready: Optional[Callable[[], bool]] = None) -> ThreadingHTTPServer:
+    """
+    Serve GET /metrics (and GET /ready: 200 once ``ready()`` is true, else 503)
+    on a daemon thread; returns the server (call .shutdown() to stop).
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"ready": staticmethod(ready) if ready else None})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
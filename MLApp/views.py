@@ -1,3 +1,134 @@
-from django.shortcuts import render
+"""
+Async JSON API over the course catalog (served by MLTTW/asgi.py).
 
-# Create your views here.
+All endpoints are read-only GETs. Bodies are serialized with orjson and
+carry an ETag derived from the body, so repeat requests with a matching
+If-None-Match get an empty 304. Listings use keyset pagination: each page
+returns an opaque ``next`` cursor instead of accepting an OFFSET.
+"""
+import base64
+import hashlib
+import math
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+
+from . import search
+
+MAX_LIMIT = 100
+SEARCH_MAX_AGE = 60
+FACETS_MAX_AGE = 300
+RECOMMEND_MAX_AGE = 300
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _json(request, data, status=200, max_age=0):
+    body = orjson.dumps(data)
+    if status != 200:
+        return HttpResponse(body, status=status, content_type="application/json")
+
+    etag = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    if etag in request.headers.get("If-None-Match", ""):
+        resp = HttpResponseNotModified()
+    else:
+        resp = HttpResponse(body, content_type="application/json")
+    resp["ETag"] = etag
+    patch_cache_control(resp, public=True, max_age=max_age)
+    return resp
+
+
+def _encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(values)).rstrip(b"=").decode("ascii")
+
+
+def _cursor_value(value, kind):
+    """A cursor element as ``kind`` (int: signed 64-bit id, float: finite rank)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise BadRequest("invalid cursor")
+    if kind is int:
+        if not isinstance(value, int) or not INT64_MIN <= value <= INT64_MAX:
+            raise BadRequest("invalid cursor")
+        return value
+    value = float(value)
+    if not math.isfinite(value):
+        raise BadRequest("invalid cursor")
+    return value
+
+
+def _decode_cursor(cursor: str, kinds: tuple) -> list:
+    """Decode a ``next`` cursor whose elements must have the types in ``kinds``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = orjson.loads(raw)
+    except (ValueError, orjson.JSONDecodeError):
+        raise BadRequest("invalid cursor")
+    if not isinstance(values, list) or len(values) != len(kinds):
+        raise BadRequest("invalid cursor")
+    return [_cursor_value(v, kind) for v, kind in zip(values, kinds)]
+
+
+def _limit(request, default=20) -> int:
+    try:
+        limit = int(request.GET.get("limit", default))
+    except ValueError:
+        raise BadRequest("limit must be an integer")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+@require_GET
+async def course_search(request):
+    """GET /api/courses/?q=&site=&category=&limit=&cursor="""
+    q = request.GET.get("q", "").strip()
+    site = request.GET.get("site") or None
+    category = request.GET.get("category") or None
+    try:
+        limit = _limit(request)
+        cursor = request.GET.get("cursor")
+
+        if q:
+            after = _decode_cursor(cursor, (float, int)) if cursor else None  # (rank, id)
+            rows = await sync_to_async(search.search_courses)(
+                q, site=site, category=category, limit=limit, after=after)
+            next_key = [rows[-1]["rank"], rows[-1]["id"]] if len(rows) == limit else None
+        else:
+            after = _decode_cursor(cursor, (int,)) if cursor else None  # (id,)
+            rows = await sync_to_async(search.browse_courses)(
+                site=site, category=category, limit=limit, after_id=after[0] if after else None)
+            next_key = [rows[-1]["id"]] if len(rows) == limit else None
+    except BadRequest as e:
+        return _json(request, {"error": str(e)}, status=400)
+
+    return _json(request, {
+        "results": rows,
+        "next": _encode_cursor(next_key) if next_key else None,
+    }, max_age=SEARCH_MAX_AGE)
+
+
+@require_GET
+async def course_facets(request):
+    """GET /api/courses/facets/?q="""
+    q = request.GET.get("q", "").strip()
+    facets = await sync_to_async(search.facet_counts)(q)
+    return _json(request, {"facets": facets}, max_age=FACETS_MAX_AGE)
+
+
+@require_GET
+async def course_recommendations(request, course_id: int):
+    """GET /api/courses/<id>/recommendations/?limit="""
+    try:
+        limit = _limit(request, default=10)
+    except BadRequest as e:
+        return _json(request, {"error": str(e)}, status=400)
+    rows = None
+    if course_id <= INT64_MAX:
+        rows = await sync_to_async(search.recommend_courses)(course_id, limit=limit)
+    if rows is None:
+        return _json(request, {"error": "course not found"}, status=404)
+    return _json(request, {"course_id": course_id, "results": rows}, max_age=RECOMMEND_MAX_AGE)
@@ -2,6 +2,9 @@
 ASGI config for MLTTW project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The JSON API in MLApp.views is async, so run it under an ASGI server, e.g.:
+
+    uvicorn MLTTW.asgi:application --workers 4
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -74,10 +74,31 @@ WSGI_APPLICATION = 'MLTTW.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+#
+# SQLite is tuned for a read-heavy workload (course search):
+#   - WAL lets readers run concurrently with a writer
+#   - synchronous=NORMAL is safe under WAL and avoids an fsync per commit
+#   - cache_size is in KiB when negative (64 MiB page cache per connection)
+#   - mmap_size maps the first 256 MiB of the file instead of read() calls
+#   - CONN_MAX_AGE keeps connections (and their warm caches) across requests
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA cache_size=-65536;'
+                'PRAGMA mmap_size=268435456;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        },
     }
 }
 
@@ -0,0 +1,172 @@
+"""
+Local stand-in for the KURSBUL chat WebSocket, for load tests.
+
+Speaks the protocol ui.call_backend_ws expects: one JSON request
+({"prompt", "messages"}), then {"text": ...} frames and a final
+{"done": true}.
+
+By default it also implements the optional delta-history extensions of
+ui.call_backend_ws (see KURSBUL_HISTORY_MODE there), which the real
+backend is not known to support: it stores session_len per session_id,
+answers a delta whose base does not match with {"resync": true}, and
+echoes session_len in the done frame. ``--plain`` turns them off and
+ignores the session fields, modelling a backend without them; the client
+then keeps sending the bounded full history.
+
+    python -m benchmarks.fake_kursbul --port 8765 --ttff 0.3 --tokens-per-sec 40
+    KURSBUL_API_BASE=ws://127.0.0.1:8765 python ui.py
+
+Timing: the first frame is sent ``ttff`` (+ up to ``jitter``) seconds
+after the request, then ``answer-tokens`` words follow at
+``tokens-per-sec``, ``frame-tokens`` words per frame. Error injection:
+``error-rate`` closes the connection with 1011 half-way through the
+answer, ``stall-rate`` stops sending without a done frame (the client
+hits WS_READ_TIMEOUT).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+_WORDS = ("kurs", "python", "veri", "bilimi", "başlangıç", "proje", "öğren", "saat", "ücretsiz",
+          "sertifika", "modül", "pratik", "ileri", "seviye", "yol", "haritası")
+
+
+@dataclass
+class FakeConfig:
+    ttff: float = 0.3
+    jitter: float = 0.1
+    tokens_per_sec: float = 40.0
+    answer_tokens: int = 120
+    frame_tokens: int = 4
+    error_rate: float = 0.0
+    stall_rate: float = 0.0
+    max_sessions: int = 100_000
+    seed: int = 0
+    plain: bool = False
+
+
+class FakeKursbul:
+    def __init__(self, cfg: FakeConfig):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.seed)
+        self.sessions: "OrderedDict[str, int]" = OrderedDict()  # session_id -> session_len
+        self.stats = {"connections": 0, "requests": 0, "resyncs": 0, "errors": 0, "stalls": 0,
+                      "active": 0, "peak_active": 0}
+
+    def _session_ok(self, req: dict) -> bool:
+        """Apply a delta/full request to the session store; False means the client must resync."""
+        sid = req.get("session_id")
+        if not sid or self.cfg.plain:
+            return True
+        base = int(req.get("base") or 0)
+        if base > 0 and self.sessions.get(sid) != base:
+            return False
+        self.sessions[sid] = int(req.get("session_len") or 0)
+        self.sessions.move_to_end(sid)
+        while len(self.sessions) > self.cfg.max_sessions:
+            self.sessions.popitem(last=False)
+        return True
+
+    async def handler(self, ws):
+        st = self.stats
+        st["connections"] += 1
+        st["active"] += 1
+        st["peak_active"] = max(st["peak_active"], st["active"])
+        try:
+            while True:
+                req = json.loads(await ws.recv())
+                st["requests"] += 1
+                if not self._session_ok(req):
+                    st["resyncs"] += 1
+                    await ws.send(json.dumps({"resync": True}))
+                    continue
+                await self._answer(ws, req)
+                return
+        except ConnectionClosed:
+            pass
+        finally:
+            st["active"] -= 1
+
+    async def _answer(self, ws, req: dict):
+        cfg, rng = self.cfg, self.rng
+        fail = rng.random() < cfg.error_rate
+        stall = not fail and rng.random() < cfg.stall_rate
+        words = [rng.choice(_WORDS) for _ in range(cfg.answer_tokens)]
+        step = max(1, cfg.frame_tokens)
+        interval = step / cfg.tokens_per_sec if cfg.tokens_per_sec > 0 else 0.0
+
+        await asyncio.sleep(cfg.ttff + rng.uniform(0, cfg.jitter))
+        for i in range(0, len(words), step):
+            if i and interval:
+                await asyncio.sleep(interval)
+            if (fail or stall) and i >= len(words) // 2:
+                break
+            await ws.send(json.dumps({"text": " ".join(words[i:i + step]) + " "}, ensure_ascii=False))
+        if fail:
+            self.stats["errors"] += 1
+            await ws.close(1011, "injected error")
+        elif stall:
+            self.stats["stalls"] += 1
+            await ws.wait_closed()
+        elif cfg.plain:
+            await ws.send(json.dumps({"done": True}))
+        else:
+            await ws.send(json.dumps({"done": True, "session_len": self.sessions.get(req.get("session_id"))}))
+
+
+async def serve_forever(cfg: FakeConfig, host: str = "127.0.0.1", port: int = 8765):
+    fake = FakeKursbul(cfg)
+    # any path is accepted, so both ws://host:port and ws://host:port/ws work
+    async with serve(fake.handler, host, port, ping_interval=None, backlog=1024):
+        print(f"Fake KURSBUL listening on ws://{host}:{port}/ws", flush=True)
+        last = 0
+        while True:
+            await asyncio.sleep(10)
+            if fake.stats["requests"] != last:
+                last = fake.stats["requests"]
+                print(" ".join(f"{k}={v}" for k, v in fake.stats.items()), flush=True)
+
+
+def add_arguments(ap: argparse.ArgumentParser) -> None:
+    d = FakeConfig()
+    ap.add_argument("--ttff", type=float, default=d.ttff, help="seconds to the first frame")
+    ap.add_argument("--jitter", type=float, default=d.jitter, help="extra random 0..jitter s on ttff")
+    ap.add_argument("--tokens-per-sec", type=float, default=d.tokens_per_sec)
+    ap.add_argument("--answer-tokens", type=int, default=d.answer_tokens, help="words per answer")
+    ap.add_argument("--frame-tokens", type=int, default=d.frame_tokens, help="words per text frame")
+    ap.add_argument("--error-rate", type=float, default=d.error_rate, help="fraction closed with 1011 mid-answer")
+    ap.add_argument("--stall-rate", type=float, default=d.stall_rate, help="fraction that never send done")
+    ap.add_argument("--seed", type=int, default=d.seed)
+    ap.add_argument("--plain", action="store_true",
+                    help="no session store, resync or session_len echo (a backend without delta history)")
+
+
+def config_from_args(args) -> FakeConfig:
+    return FakeConfig(ttff=args.ttff, jitter=args.jitter, tokens_per_sec=args.tokens_per_sec,
+                      answer_tokens=args.answer_tokens, frame_tokens=args.frame_tokens,
+                      error_rate=args.error_rate, stall_rate=args.stall_rate, seed=args.seed,
+                      plain=args.plain)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    add_arguments(ap)
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(serve_forever(config_from_args(args), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Concurrent load test for the chat path against benchmarks.fake_kursbul.
+
+    python -m benchmarks.loadtest --sessions 300 --turns 3              # ws mode, spawns the fake backend
+    python -m benchmarks.loadtest --mode respond --sessions 200 --history-mode delta
+    python -m benchmarks.loadtest --mode gradio --gradio-url http://127.0.0.1:7860 --backend ws://127.0.0.1:8765
+
+Each simulated session sends ``--turns`` messages one after another,
+keeping its own history and session id; sessions start spread over
+``--ramp`` seconds and all run concurrently.
+
+Modes:
+  ws       ui.call_backend_ws for every session on one event loop
+           (connection handling; first token measured exactly)
+  respond  ui.respond from a thread per session, the way Gradio workers
+           call it (one asyncio.run per turn); first token comes from the
+           ws_first_frame histogram, so it is a bucket estimate
+  gradio   the "chat" endpoint of a running ui.py through gradio_client
+           (queueing and HTTP included); end-to-end only
+
+Without ``--backend`` the fake backend is started in a subprocess with
+the --ttff/--tokens-per-sec/... options below; add ``--plain`` to
+measure delta mode against a backend that does not support it. Prints throughput and
+p50/p95/p99 latencies; ``--out`` also writes them as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from websockets.sync.client import connect as ws_connect
+
+from benchmarks import fake_kursbul
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SYSTEM_PROMPT = "Sen bir kurs asistanısın."
+PROMPTS = ("Ücretsiz Python başlangıç kursu", "React + TypeScript yol haritası",
+           "Veri bilimine hızlı giriş", "Makine öğrenmesi için matematik")
+
+
+def percentile(sorted_values: list[float], q: float) -> Optional[float]:
+    """Linear-interpolated q-quantile (0..1) of an already sorted list."""
+    if not sorted_values:
+        return None
+    pos = q * (len(sorted_values) - 1)
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def latency_summary(values: list[float]) -> dict:
+    v = sorted(values)
+    return {"n": len(v), **{f"p{int(q * 100)}_ms": round(percentile(v, q) * 1000, 1) if v else None
+                            for q in (0.5, 0.95, 0.99)},
+            "max_ms": round(v[-1] * 1000, 1) if v else None}
+
+
+class Recorder:
+    def __init__(self):
+        self.e2e: list[float] = []
+        self.first: list[float] = []
+        self.ok = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, ok: bool, e2e: float, first: Optional[float] = None):
+        with self._lock:
+            if ok:
+                self.ok += 1
+                self.e2e.append(e2e)
+                if first is not None:
+                    self.first.append(first)
+            else:
+                self.errors += 1
+
+
+def _prompt(i: int, turn: int) -> str:
+    return f"{PROMPTS[(i + turn) % len(PROMPTS)]} (oturum {i}, soru {turn + 1})"
+
+
+# ---------------------------------------------------------------------
+# Modes
+# ---------------------------------------------------------------------
+
+def run_ws(args, rec: Recorder, ui):
+    async def session(i: int):
+        await asyncio.sleep(args.ramp * i / max(1, args.sessions))
+        sid, history = uuid.uuid4().hex, []
+        for turn in range(args.turns):
+            prompt = _prompt(i, turn)
+            t0 = time.perf_counter()
+            first: list[float] = []
+            try:
+                answer = await ui.call_backend_ws(
+                    prompt, history, SYSTEM_PROMPT, sid,
+                    on_text=lambda _: first or first.append(time.perf_counter() - t0))
+            except Exception:
+                rec.add(False, time.perf_counter() - t0)
+                continue
+            rec.add(True, time.perf_counter() - t0, first[0] if first else None)
+            history.append((prompt, answer))
+            await asyncio.sleep(args.think)
+
+    async def main():
+        await asyncio.gather(*(session(i) for i in range(args.sessions)))
+
+    asyncio.run(main())
+
+
+def run_respond(args, rec: Recorder, ui):
+    def session(i: int):
+        time.sleep(args.ramp * i / max(1, args.sessions))
+        sid, history = uuid.uuid4().hex, []
+        for turn in range(args.turns):
+            t0 = time.perf_counter()
+            history, _, _ = ui.respond(_prompt(i, turn), history, SYSTEM_PROMPT, args.auto_search,
+                                       None, [], [], sid)
+            rec.add(not history[-1][1].startswith("❌"), time.perf_counter() - t0)
+            time.sleep(args.think)
+
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        list(pool.map(session, range(args.sessions)))
+
+
+def run_gradio(args, rec: Recorder, clients):
+    def session(i: int):
+        time.sleep(args.ramp * i / max(1, args.sessions))
+        client = clients[i]
+        for turn in range(args.turns):
+            t0 = time.perf_counter()
+            try:
+                history, _, _ = client.predict(_prompt(i, turn), SYSTEM_PROMPT, args.auto_search,
+                                               None, [], [], api_name="/chat")
+                ok = bool(history) and not str(history[-1][1]).startswith("❌")
+            except Exception:
+                ok = False
+            rec.add(ok, time.perf_counter() - t0)
+            time.sleep(args.think)
+
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        list(pool.map(session, range(args.sessions)))
+
+
+MODES = {"ws": run_ws, "respond": run_respond, "gradio": run_gradio}
+
+
+def prepare(args):
+    """
+    Do everything that must not count as load before the clock starts:
+    import ui (and gradio with it) and load the catalog, or connect the
+    gradio clients. Returns what the mode function takes as its third argument.
+    """
+    if args.mode == "gradio":
+        from gradio_client import Client
+
+        # one client per session: the server keeps the chat session id in per-client state
+        with ThreadPoolExecutor(max_workers=min(32, args.sessions)) as pool:
+            return list(pool.map(lambda _: Client(args.gradio_url, verbose=False), range(args.sessions)))
+
+    import ui
+    from MLApp.utils import metrics
+
+    if args.auto_search:
+        ui.load_courses_df()
+    metrics.reset()
+    return ui
+
+
+# ---------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def spawned_backend(args):
+    """Run benchmarks.fake_kursbul in a subprocess so it does not share our GIL."""
+    port = _free_port()
+    cmd = [sys.executable, "-m", "benchmarks.fake_kursbul", "--port", str(port),
+           "--ttff", str(args.ttff), "--jitter", str(args.jitter),
+           "--tokens-per-sec", str(args.tokens_per_sec), "--answer-tokens", str(args.answer_tokens),
+           "--frame-tokens", str(args.frame_tokens), "--error-rate", str(args.error_rate),
+           "--stall-rate", str(args.stall_rate), "--seed", str(args.seed)]
+    if args.plain:
+        cmd.append("--plain")
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL)
+    try:
+        url = f"ws://127.0.0.1:{port}"
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                ws_connect(url, open_timeout=1).close()
+                break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("fake KURSBUL backend did not start")
+                time.sleep(0.05)
+        yield url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def run(args) -> dict:
+    if args.history_mode:
+        os.environ["KURSBUL_HISTORY_MODE"] = args.history_mode
+    rec = Recorder()
+
+    def go():
+        ctx = prepare(args)
+        t0 = time.perf_counter()
+        MODES[args.mode](args, rec, ctx)
+        return time.perf_counter() - t0
+
+    if args.backend or args.mode == "gradio":
+        if args.backend:
+            os.environ["KURSBUL_API_BASE"] = args.backend
+        wall = go()
+    else:
+        with spawned_backend(args) as url:
+            os.environ["KURSBUL_API_BASE"] = url
+            wall = go()
+
+    first = latency_summary(rec.first)
+    read_timeouts = None
+    if args.mode != "gradio":
+        from MLApp.utils import metrics
+        read_timeouts = metrics.counter("ws_read_timeouts_total").value
+    if args.mode == "respond":
+        h = metrics.histogram("stage_seconds", stage="ws_first_frame")
+        first = {"n": h.count, "estimate": "histogram",
+                 **{f"p{int(q * 100)}_ms": round(h.quantile(q) * 1000, 1) if h.count else None
+                    for q in (0.5, 0.95, 0.99)}}
+
+    return {
+        "meta": {
+            "mode": args.mode,
+            "sessions": args.sessions,
+            "turns": args.turns,
+            "ramp_s": args.ramp,
+            "think_s": args.think,
+            "history_mode": os.getenv("KURSBUL_HISTORY_MODE", "full"),
+            "backend": args.backend or "spawned fake_kursbul",
+            "fake": {k: getattr(args, k) for k in ("ttff", "jitter", "tokens_per_sec", "answer_tokens",
+                                                  "frame_tokens", "error_rate", "stall_rate", "plain")},
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "wall_s": round(wall, 3),
+        "ok": rec.ok,
+        "errors": rec.errors,
+        "read_timeouts": read_timeouts,  # partial answers after WS_READ_TIMEOUT, included in ok/e2e
+        "throughput_turns_per_s": round(rec.ok / wall, 2) if wall else None,
+        "e2e": latency_summary(rec.e2e),
+        "first_token": first,
+    }
+
+
+def _print_report(r: dict) -> None:
+    m = r["meta"]
+    print(f"mode={m['mode']} sessions={m['sessions']} turns={m['turns']} history={m['history_mode']}")
+    print(f"wall {r['wall_s']:.2f} s   ok {r['ok']}   errors {r['errors']}   "
+          f"throughput {r['throughput_turns_per_s']} turns/s"
+          + (f"   read timeouts {r['read_timeouts']}" if r["read_timeouts"] is not None else ""))
+    for label, s in (("end-to-end", r["e2e"]), ("first token", r["first_token"])):
+        if s.get("p50_ms") is None:
+            print(f"{label:<12} n/a")
+            continue
+        note = " (histogram estimate)" if s.get("estimate") else ""
+        print(f"{label:<12} p50 {s['p50_ms']:8.1f} ms  p95 {s['p95_ms']:8.1f} ms  p99 {s['p99_ms']:8.1f} ms{note}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mode", choices=sorted(MODES), default="ws")
+    ap.add_argument("--sessions", type=int, default=200, help="concurrent simulated sessions")
+    ap.add_argument("--turns", type=int, default=3, help="messages per session")
+    ap.add_argument("--ramp", type=float, default=1.0, help="seconds over which sessions start")
+    ap.add_argument("--think", type=float, default=0.0, help="pause between a session's turns")
+    ap.add_argument("--history-mode", choices=["full", "bounded", "delta"],
+                    help="KURSBUL_HISTORY_MODE for ws/respond (default: environment)")
+    ap.add_argument("--auto-search", action="store_true", help="respond/gradio: also run the course search")
+    ap.add_argument("--backend", help="existing KURSBUL_API_BASE instead of spawning the fake backend")
+    ap.add_argument("--gradio-url", default="http://127.0.0.1:7860", help="gradio mode: running ui.py")
+    ap.add_argument("--out", type=Path, help="also write the report as JSON")
+    fake_kursbul.add_arguments(ap.add_argument_group("spawned fake backend"))
+    args = ap.parse_args(argv)
+
+    report = run(args)
+    _print_report(report)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
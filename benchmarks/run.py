@@ -0,0 +1,201 @@
+"""
+Benchmarks for the search and text hot paths.
+
+    python -m benchmarks.run                                  # 10k / 100k catalog rows
+    python -m benchmarks.run --sizes 10000 100000 1000000 --repeat 7
+    python -m benchmarks.run --compare benchmarks/results/<old>.json
+
+Cases: ui.load_courses_df (cold), ui.search_courses under several filter
+combinations, MLApp.test.analyze_top_words and ui._history_to_messages.
+Each case gets one warm-up call, ``--repeat`` timed calls and one extra
+call under tracemalloc for peak memory. Inputs come from benchmarks.synth
+and are cached in ``--data-dir`` so every run sees identical data.
+
+Results are written as JSON to benchmarks/results/<commit>.json; with
+``--compare`` the median time and peak memory of every case are checked
+against an earlier result and regressions beyond ``--threshold`` reported.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional
+
+from benchmarks import synth
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+# (query, max_price, durations, providers); search_courses does not filter on
+# durations, so it stays empty. Providers match the synthetic catalog's Site values.
+SEARCH_CASES = {
+    "query": ("python", None, [], []),
+    "query+providers": ("data", None, [], ["Coursera", "Udacity"]),
+    "query+max_price": ("data", 100.0, [], []),
+    "all_filters": ("design", 50.0, [], ["Coursera"]),
+    "no_query": ("", None, [], []),
+    "no_match": ("zzqxv", None, [], []),
+}
+
+
+def measure(fn: Callable[[], object], setup: Optional[Callable[[], None]] = None, repeat: int = 5) -> dict:
+    if setup:
+        setup()
+    fn()  # warm-up
+
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_s": statistics.median(times),
+        "min_s": min(times),
+        "max_s": max(times),
+        "runs": repeat,
+        "peak_bytes": peak,
+    }
+
+
+def _git_commit() -> tuple[str, bool]:
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=PROJECT_ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+        return sha, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def _cached(path: Path, make: Callable[[Path], Path]) -> Path:
+    if not path.exists():
+        print(f"  generating {path.name} ...", flush=True)
+        make(path)
+    return path
+
+
+def run(sizes: list[int], corpus_sizes: list[int], history_turns: list[int],
+        repeat: int, data_dir: Path, seed: int) -> dict:
+    import ui
+    from MLApp.test import analyze_top_words
+
+    cases: dict[str, dict] = {}
+
+    def record(name: str, result: dict):
+        cases[name] = result
+        print(f"{name:<45} {result['median_s'] * 1000:10.2f} ms  peak {result['peak_bytes'] / 2**20:8.1f} MiB",
+              flush=True)
+
+    for n in sizes:
+        path = _cached(data_dir / f"catalog_v{synth.CATALOG_VERSION}_{n}_{seed}.csv",
+                       lambda p: synth.generate_catalog(n, p, seed=seed))
+        os.environ["KURSBUL_COURSES_FILE"] = str(path)
+
+        def reset():
+            ui._COURSES_DF = None
+
+        record(f"load_courses_df[{n}]", measure(ui.load_courses_df, setup=reset, repeat=repeat))
+
+        ui.load_courses_df()
+        for label, args in SEARCH_CASES.items():
+            record(f"search_courses[{n},{label}]",
+                   measure(lambda: ui.search_courses(*args), repeat=repeat))
+        ui._COURSES_DF = None
+
+    for n in corpus_sizes:
+        path = _cached(data_dir / f"corpus_{n}_{seed}.txt",
+                       lambda p: synth.generate_corpus(n, p, seed=seed))
+        record(f"analyze_top_words[{n}]", measure(lambda: analyze_top_words(path), repeat=repeat))
+
+    for n in history_turns:
+        history = synth.generate_history(n, seed=seed)
+        record(f"_history_to_messages[{n}]",
+               measure(lambda: ui._history_to_messages(history, "Sen bir kurs asistanısın."), repeat=repeat))
+
+    sha, dirty = _git_commit()
+    import pandas as pd
+    return {
+        "meta": {
+            "commit": sha,
+            "dirty": dirty,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "cases": cases,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Human-readable regressions of ``current`` vs ``baseline`` (empty when none)."""
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    for name, cur in current["cases"].items():
+        old = baseline["cases"].get(name)
+        if not old:
+            continue
+        t_ratio = cur["median_s"] / old["median_s"] if old["median_s"] else 1.0
+        m_ratio = cur["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        flag = ""
+        if t_ratio > 1 + threshold or m_ratio > 1 + threshold:
+            flag = "  <-- regression"
+            regressions.append(f"{name}: time x{t_ratio:.2f}, peak memory x{m_ratio:.2f}")
+        print(f"{name:<45} time x{t_ratio:5.2f}  mem x{m_ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="catalog rows")
+    ap.add_argument("--corpus-sizes", type=int, nargs="+", default=[200, 2000], help="corpus programs")
+    ap.add_argument("--history-turns", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--data-dir", type=Path, default=Path(tempfile.gettempdir()) / "kursbul-bench")
+    ap.add_argument("--out", type=Path, help="result file (default: benchmarks/results/<commit>.json)")
+    ap.add_argument("--compare", type=Path, help="earlier result JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown / growth, 0.15 = 15%%")
+    args = ap.parse_args(argv)
+
+    result = run(args.sizes, args.corpus_sizes, args.history_turns, args.repeat, args.data_dir, args.seed)
+
+    out = args.out or RESULTS_DIR / f"{result['meta']['commit']}{'-dirty' if result['meta']['dirty'] else ''}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nSaved {out}")
+
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
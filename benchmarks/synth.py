@@ -0,0 +1,138 @@
+"""
+Synthetic data shaped like the shipped files, for benchmarks.
+
+Catalog rows are built from a randomly chosen template row of
+online_courses_cleaned_trimmed.csv, so the column set, null pattern and
+category/site mix match the real data; titles and intros are re-drawn from
+the real word pools so rows are not duplicates of each other. The source
+has no provider or price column, so ``Provider`` (a copy of ``Site``) and
+a synthetic ``Price`` (``Free`` or a lira amount) are added for the
+search filters to work on. The corpus
+mimics MLApp/egitim_programlari.txt (=== title === / URL: / content lines).
+
+    python -m benchmarks.synth catalog 100000 /tmp/courses_100k.csv
+    python -m benchmarks.synth corpus 500 /tmp/programs.txt
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import re
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CATALOG_SOURCE = PROJECT_ROOT / "online_courses_cleaned_trimmed.csv"
+CORPUS_SOURCE = PROJECT_ROOT / "MLApp" / "egitim_programlari.txt"
+
+_WORD_RE = re.compile(r"\S+")
+_SITE_HOSTS = {
+    "Coursera": "https://www.coursera.org/learn/",
+    "Future Learn": "https://www.futurelearn.com/courses/",
+    "Udacity": "https://www.udacity.com/course/",
+    "Simplilearn": "https://www.simplilearn.com/",
+}
+_PRICES = (29, 49, 99, 149, 249, 499, 999)
+# bump when generate_catalog's output changes, so cached catalogs are regenerated
+CATALOG_VERSION = 2
+
+
+def _read_catalog(source: Path) -> tuple[list[str], list[dict]]:
+    with source.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        return list(reader.fieldnames or []), list(reader)
+
+
+def generate_catalog(n_rows: int, out_path: Path, seed: int = 0,
+                     source: Path = CATALOG_SOURCE) -> Path:
+    """Write ``n_rows`` synthetic catalog rows to ``out_path`` (CSV)."""
+    rng = random.Random(seed)
+    fields, templates = _read_catalog(source)
+    title_words = [w for r in templates for w in _WORD_RE.findall(r["Title"])]
+    intro_words = [w for r in templates for w in _WORD_RE.findall(r.get("Short Intro") or "")]
+
+    fields = fields + [c for c in ("Provider", "Price") if c not in fields]
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        for i in range(n_rows):
+            row = dict(rng.choice(templates))
+            n_title = max(2, len(_WORD_RE.findall(row["Title"])))
+            title = " ".join(rng.choices(title_words, k=n_title))
+            row["Title"] = title
+            if row.get("Short Intro"):
+                n_intro = len(_WORD_RE.findall(row["Short Intro"]))
+                row["Short Intro"] = " ".join(rng.choices(intro_words, k=n_intro))
+            slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+            row["URL"] = f"{_SITE_HOSTS.get(row.get('Site'), 'https://example.com/')}{slug}-{i}"
+            if row.get("Rating"):
+                row["Rating"] = f"{rng.uniform(3.5, 5.0):.1f}stars"
+            if row.get("Number of viewers"):
+                row["Number of viewers"] = f"{int(rng.paretovariate(1.2) * 50):,} "
+            row["Provider"] = row.get("Site") or ""
+            row["Price"] = "Free" if rng.random() < 0.2 else f"₺{rng.choice(_PRICES)}"
+            if fields and fields[0] in ("", "Unnamed: 0"):
+                row[fields[0]] = i
+            w.writerow(row)
+    return out_path
+
+
+def generate_corpus(n_programs: int, out_path: Path, seed: int = 0,
+                    source: Path = CORPUS_SOURCE) -> Path:
+    """Write ``n_programs`` synthetic training-program sections to ``out_path``."""
+    rng = random.Random(seed)
+    text = source.read_text(encoding="utf-8")
+    sections = [s for s in text.split("=== ")[1:] if s.strip()]
+    words = _WORD_RE.findall(text)
+    line_lengths = [len(_WORD_RE.findall(l)) for s in sections for l in s.splitlines()[2:] if l.strip()]
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8") as f:
+        for i in range(n_programs):
+            title = " ".join(rng.choices(words, k=rng.randint(3, 6)))
+            f.write(f"=== {title} ===\n")
+            f.write(f"URL: https://example.com/egitimler/program-{i}\n")
+            for _ in range(rng.randint(5, 40)):
+                f.write(" ".join(rng.choices(words, k=rng.choice(line_lengths))) + "\n")
+            f.write("\n")
+    return out_path
+
+
+def generate_history(n_turns: int, seed: int = 0,
+                     user_chars: int = 120, bot_chars: int = 900) -> list[tuple[str, str]]:
+    """A chat history of ``n_turns`` (user, assistant) tuples with realistic message sizes."""
+    rng = random.Random(seed)
+    words = _WORD_RE.findall(CORPUS_SOURCE.read_text(encoding="utf-8"))
+
+    def message(avg_chars: int) -> str:
+        target = int(rng.expovariate(1 / avg_chars)) + 10
+        out, size = [], 0
+        while size < target:
+            w = rng.choice(words)
+            out.append(w)
+            size += len(w) + 1
+        return " ".join(out)
+
+    return [(message(user_chars), message(bot_chars)) for _ in range(n_turns)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("kind", choices=["catalog", "corpus"])
+    ap.add_argument("n", type=int, help="rows (catalog) or programs (corpus)")
+    ap.add_argument("out", type=Path)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    if args.kind == "catalog":
+        generate_catalog(args.n, args.out, args.seed)
+    else:
+        generate_corpus(args.n, args.out, args.seed)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,36 @@ import sys
 import json
 import time
 import asyncio
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 from urllib.parse import urlparse, urlunparse
 
-import gradio as gr
-import websockets
-from dotenv import load_dotenv
+# ---------------------------------------------------------------------
+# Startup profile (reported at launch, see _report_stages)
+# ---------------------------------------------------------------------
+_T0 = time.perf_counter()
+STARTUP_STAGES: list[tuple[str, float]] = []
+
+
+@contextmanager
+def _startup_stage(name: str):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_STAGES.append((name, time.perf_counter() - t))
+
+
+with _startup_stage("import gradio"):
+    import gradio as gr
+with _startup_stage("import dotenv"):
+    from dotenv import load_dotenv
+# websockets and pandas are imported by the warm-up thread (and lazily on use)
 
 # ---------------------------------------------------------------------
 # Make project root importable
@@ -23,12 +46,15 @@ if str(PROJECT_ROOT) not in sys.path:
 # ---------------------------------------------------------------------
 # Logging (robust import with fallback)
 # ---------------------------------------------------------------------
-load_dotenv(PROJECT_ROOT / ".env")
+with _startup_stage("load .env"):
+    load_dotenv(PROJECT_ROOT / ".env")
+_logging_t0 = time.perf_counter()
 try:
-    from MLApp.utils.logging_setup import setup_logging, get_logger, LOG_FILE  # type: ignore
+    from MLApp.utils.logging_setup import setup_logging, get_logger, log_queue_stats, LOG_FILE  # type: ignore
     setup_logging()
     log = get_logger("ui")
 except Exception:
+    log_queue_stats = None
     import logging
     LOG_FILE = PROJECT_ROOT / "logs" / "app.log"
     LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -38,6 +64,24 @@ except Exception:
         handlers=[logging.FileHandler(LOG_FILE), logging.StreamHandler(sys.stdout)],
     )
     log = logging.getLogger("ui")
+STARTUP_STAGES.append(("logging setup", time.perf_counter() - _logging_t0))
+
+with _startup_stage("import MLApp.utils"):
+    from MLApp.utils import metrics
+    from MLApp.utils.chat_store import ChatStore
+
+if log_queue_stats is not None:
+    metrics.gauge("log_queue_depth", lambda: log_queue_stats()["queued"], "Log records waiting for the writer")
+    metrics.gauge("log_records_dropped", lambda: log_queue_stats()["dropped"], "Log records dropped (queue full)")
+
+# Chat history lives server-side; the browser only holds the session id.
+# Session files idle for CHAT_RETENTION_DAYS are swept (0 keeps them forever).
+_chat_retention_days = float(os.getenv("CHAT_RETENTION_DAYS", "30"))
+CHAT_STORE = ChatStore(PROJECT_ROOT / "logs" / "chats" / "sessions",
+                       max_hot=int(os.getenv("CHAT_HOT_SESSIONS", "256")),
+                       retention=_chat_retention_days * 86400 if _chat_retention_days > 0 else None)
+metrics.gauge("chat_store_hits", lambda: CHAT_STORE.hits, "Chat history reads served from memory")
+metrics.gauge("chat_store_misses", lambda: CHAT_STORE.misses, "Chat history reads loaded from disk")
 
 # =====================================================================
 # Helpers
@@ -103,20 +147,145 @@ def _build_ws_url(base: str) -> str:
 
     return urlunparse((scheme, p.netloc, path, "", p.query, ""))
 
+# =====================================================================
+# History transport
+# =====================================================================
+#
+# KURSBUL_HISTORY_MODE:
+#   full    – send the whole conversation every turn (original behaviour)
+#   bounded – send at most KURSBUL_HISTORY_MAX_CHARS of recent messages;
+#             older turns collapse into one short system note
+#   delta   – send session_id, base and only the messages the server has
+#             not acknowledged yet, plus session_len = base + len(messages).
+#             Both counts are in the client's numbering: with base > 0 the
+#             server appends "messages" to its copy, with base = 0 it replaces
+#             it (the bounded full history), and either way it remembers
+#             session_len. The prompt and answer come back as messages on
+#             the next turn. A server whose stored session_len != base answers
+#             {"resync": true} and gets the bounded full history instead.
+#             Deltas start only once the server has echoed the same
+#             session_len in its final {"done": true} frame; a server that
+#             does not echo it keeps getting the bounded full history.
+
+HISTORY_MODES = ("full", "bounded", "delta")
+_WS_SESSIONS_MAX = 1024
+_ws_sessions: "OrderedDict[str, tuple[int, str]]" = OrderedDict()  # sid -> (acked msgs, prefix digest)
+_ws_sessions_lock = threading.Lock()
+
+
+def _history_mode() -> str:
+    mode = os.getenv("KURSBUL_HISTORY_MODE", "full").strip().lower()
+    return mode if mode in HISTORY_MODES else "full"
+
+
+def _summarize_dropped(dropped: list[dict]) -> str:
+    asks = [m["content"].strip().replace("\n", " ")[:80] for m in dropped if m["role"] == "user"]
+    note = f"[Önceki {len(dropped)} mesaj kısaltıldı.]"
+    if asks:
+        note += " Kullanıcının önceki soruları: " + " | ".join(asks[-5:])
+    return note
+
+
+def _bound_messages(msgs: list[dict], max_chars: int) -> list[dict]:
+    """
+    Keep the system prompt and the newest messages that fit in ``max_chars``.
+
+    The note summarising dropped messages counts toward ``max_chars``: older
+    kept messages give way to it, and it is clipped if it still does not fit.
+    """
+    system = msgs[:1] if msgs and msgs[0]["role"] == "system" else []
+    rest = msgs[len(system):]
+    kept: list[dict] = []
+    used = 0
+    for m in reversed(rest):
+        n = len(m["content"])
+        if used + n > max_chars:
+            if not kept:  # always keep the latest message, clipped to the budget
+                tail = m["content"][len(m["content"]) - max_chars + 1:] if max_chars > 1 else ""
+                kept.append({"role": m["role"], "content": "…" + tail})
+                used = len(kept[0]["content"])
+            break
+        kept.append(m)
+        used += n
+    kept.reverse()
+    dropped = rest[:len(rest) - len(kept)]
+    if not dropped:
+        return system + kept
+
+    note = _summarize_dropped(dropped)
+    while len(kept) > 1 and used + len(note) > max_chars:
+        used -= len(kept.pop(0)["content"])
+        note = _summarize_dropped(rest[:len(rest) - len(kept)])
+    note = note[:max(0, max_chars - used)]
+    return system + ([{"role": "system", "content": note}] if note else []) + kept
+
+
+def _prefix_digest(msgs: list[dict]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for m in msgs:
+        h.update(m["role"].encode())
+        h.update(b"\0")
+        h.update(m["content"].encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _build_payloads(prompt: str, msgs: list[dict], session_id: Optional[str]) -> tuple[dict, Optional[dict]]:
+    """
+    Return (first payload to send, full payload to fall back to on resync).
+
+    The fallback is None unless the first payload is a delta.
+    """
+    mode = _history_mode()
+    max_chars = int(os.getenv("KURSBUL_HISTORY_MAX_CHARS", "12000"))
+    if mode == "full":
+        return {"prompt": prompt, "messages": msgs}, None
+
+    full = {"prompt": prompt, "messages": _bound_messages(msgs, max_chars)}
+    if mode == "bounded" or not session_id:
+        return full, None
+
+    full.update(session_id=session_id, base=0, session_len=len(msgs))
+    with _ws_sessions_lock:
+        acked, digest = _ws_sessions.get(session_id, (0, ""))
+    if 0 < acked <= len(msgs) and _prefix_digest(msgs[:acked]) == digest:
+        return {"prompt": prompt, "session_id": session_id, "base": acked,
+                "messages": msgs[acked:], "session_len": len(msgs)}, full
+    return full, None
+
+
+def _ack_session(session_id: str, msgs: list[dict]) -> None:
+    with _ws_sessions_lock:
+        _ws_sessions[session_id] = (len(msgs), _prefix_digest(msgs))
+        _ws_sessions.move_to_end(session_id)
+        while len(_ws_sessions) > _WS_SESSIONS_MAX:
+            _ws_sessions.popitem(last=False)
+
+
+def _forget_session(session_id: str) -> None:
+    with _ws_sessions_lock:
+        _ws_sessions.pop(session_id, None)
+
+
+def _dumps(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
 # =====================================================================
 # Backend adapter (WebSocket)
 # =====================================================================
 
 async def call_backend_ws(prompt: str,
                           history_tuples: List[Tuple[str, str]],
-                          system_prompt: str) -> str:
+                          system_prompt: str,
+                          session_id: Optional[str] = None,
+                          on_text: Optional[Callable[[str], None]] = None) -> str:
+    """``on_text`` is called with every streamed chunk as it arrives (e.g. for first-token timing)."""
     base = os.getenv("KURSBUL_API_BASE", "")
     url = _build_ws_url(base)
+    import websockets
 
-    payload = {
-        "prompt": prompt,
-        "messages": _history_to_messages(history_tuples, system_prompt),
-    }
+    msgs = _history_to_messages(history_tuples, system_prompt)
+    payload, fallback = _build_payloads(prompt, msgs, session_id)
 
     # Optional Authorization
     headers: list[tuple[str, str]] = []
@@ -128,38 +297,78 @@ async def call_backend_ws(prompt: str,
     parts: list[str] = []
     connect_timeout = int(os.getenv("WS_CONNECT_TIMEOUT", "15"))
     read_timeout = int(os.getenv("WS_READ_TIMEOUT", "60"))
-
-    async with websockets.connect(url, extra_headers=headers, open_timeout=connect_timeout, ping_interval=None) as ws:
-        await ws.send(json.dumps(payload, ensure_ascii=False))
+    # permessage-deflate is negotiated unless WS_COMPRESSION=none
+    compression = None if os.getenv("WS_COMPRESSION", "deflate").lower() == "none" else "deflate"
+
+    t0 = time.perf_counter()
+    t_first = None
+    done = False
+    session_len = None
+    async with websockets.connect(url, additional_headers=headers, open_timeout=connect_timeout,
+                                  ping_interval=None, compression=compression) as ws:
+        metrics.observe("ws_handshake", time.perf_counter() - t0)
+        body = _dumps(payload)
+        metrics.inc("ws_sent_bytes_total", len(body.encode("utf-8")))
+        await ws.send(body)
+        t_sent = time.perf_counter()
         while True:
             try:
                 msg = await asyncio.wait_for(ws.recv(), timeout=read_timeout)
             except asyncio.TimeoutError:
                 log.warning("WS read timeout")
+                metrics.inc("ws_read_timeouts_total")
                 break
+            if t_first is None:
+                t_first = time.perf_counter()
+                metrics.observe("ws_first_frame", t_first - t_sent)
             data = {}
             try:
                 data = json.loads(msg)
             except Exception:
                 parts.append(str(msg))  # some servers stream plain text
+                if on_text:
+                    on_text(parts[-1])
+                continue
+
+            if data.get("resync") is True and fallback is not None:
+                log.info("WS session %s unknown to server, resending full history", session_id)
+                metrics.inc("ws_resyncs_total")
+                payload, fallback = fallback, None
+                body = _dumps(payload)
+                metrics.inc("ws_sent_bytes_total", len(body.encode("utf-8")))
+                await ws.send(body)
                 continue
 
-            if "answer" in data:
-                parts.append(str(data["answer"]))
-            elif "text" in data:
-                parts.append(str(data["text"]))
+            if "answer" in data or "text" in data:
+                chunk = str(data["answer"] if "answer" in data else data["text"])
+                parts.append(chunk)
+                if on_text and chunk:
+                    on_text(chunk)
 
             if data.get("done") is True:
+                done = True
+                session_len = data.get("session_len")
                 break
 
+    if done and payload.get("session_id"):
+        # only an echoed session_len shows the server stored this history; without it, resend in full
+        if type(session_len) is int and session_len == payload["session_len"]:
+            _ack_session(payload["session_id"], msgs)
+        else:
+            _forget_session(payload["session_id"])
+
+    if t_first is not None:
+        metrics.observe("ws_generation", time.perf_counter() - t_first)
     return "".join(parts).strip() or "(boş yanıt)"
 
 
 def call_backend_chat(prompt: str,
                       history_tuples: List[Tuple[str, str]],
-                      system_prompt: str) -> str:
+                      system_prompt: str,
+                      session_id: Optional[str] = None) -> str:
     try:
-        return asyncio.run(call_backend_ws(prompt, history_tuples, system_prompt))
+        with metrics.span("backend_chat"):
+            return asyncio.run(call_backend_ws(prompt, history_tuples, system_prompt, session_id))
     except Exception as e:
         log.exception("WS call failed")
         return f"❌ WebSocket hatası: {e}"
@@ -169,13 +378,28 @@ def call_backend_chat(prompt: str,
 # =====================================================================
 
 _COURSES_DF = None
+_COURSES_DF_LOCK = threading.Lock()
 
 def load_courses_df():
     """Try to load any of a few local files; fallback to empty."""
     global _COURSES_DF
-    if _COURSES_DF is not None:
+    df = _COURSES_DF
+    if df is not None:
+        metrics.cache_result("courses_df", True)
+        return df
+
+    # one loader at a time: a search arriving during warm-up waits for that load
+    with _COURSES_DF_LOCK:
+        if _COURSES_DF is None:
+            metrics.cache_result("courses_df", False)
+            _COURSES_DF = _read_courses_df()
+        else:
+            metrics.cache_result("courses_df", True)
         return _COURSES_DF
 
+
+@metrics.timed("load_courses_df")
+def _read_courses_df():
     import pandas as pd
 
     candidates = [
@@ -184,6 +408,9 @@ def load_courses_df():
         PROJECT_ROOT / "online_courses.csv",
         PROJECT_ROOT / "enriched_courses_final.xlsx",
     ]
+    override = os.getenv("KURSBUL_COURSES_FILE")
+    if override:
+        candidates.insert(0, Path(override))
     for p in candidates:
         try:
             if p.exists():
@@ -191,17 +418,15 @@ def load_courses_df():
                     df = pd.read_excel(p)
                 else:
                     df = pd.read_csv(p)
-                _COURSES_DF = df
                 log.info("Loaded course dataset: %s (%s rows)", p.name, len(df))
-                return _COURSES_DF
+                return df
         except Exception:
             continue
 
-    import pandas as pd
-    _COURSES_DF = pd.DataFrame()
-    return _COURSES_DF
+    return pd.DataFrame()
 
 
+@metrics.timed("search_courses")
 def search_courses(query: str,
                    max_price: Optional[float],
                    durations: List[str],
@@ -277,6 +502,43 @@ def search_courses(query: str,
     small = out[keep].rename(columns={title_c: "title", prov_c: "provider", dur_c: "duration", price_c: "price"}) if keep else out
     return cards_md, small.reset_index(drop=True)
 
+# =====================================================================
+# Enrollment dashboard (reads precomputed rollups, see MLApp/rollups.py)
+# =====================================================================
+
+DB_FILE = PROJECT_ROOT / "db.sqlite3"
+ROLLUP_COLUMNS = ["period_start", "course_name", "user_level", "count"]
+
+
+def enrollment_rollups(period: str = "month", course: str = "", level: str = ""):
+    """Rollup rows from db.sqlite3 (read-only) — returns (markdown, dataframe)."""
+    import sqlite3
+    import pandas as pd
+
+    sql = ["SELECT period_start, course_name, user_level, count FROM MLApp_enrollmentrollup",
+           "WHERE period = ? AND count > 0"]
+    params: list = [period]
+    if course and course.strip():
+        sql.append("AND course_name = ?")
+        params.append(course.strip())
+    if level:
+        sql.append("AND user_level = ?")
+        params.append(level)
+    sql.append("ORDER BY period_start, course_name, user_level")
+
+    try:
+        con = sqlite3.connect(f"file:{DB_FILE}?mode=ro", uri=True)
+        try:
+            rows = con.execute(" ".join(sql), params).fetchall()
+        finally:
+            con.close()
+    except sqlite3.Error as e:
+        log.warning("Enrollment rollups unavailable: %s", e)
+        return f"Kayıt özeti okunamadı: {e}", pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    df = pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+    return f"**Toplam kayıt:** {int(df['count'].sum()) if len(df) else 0}", df
+
 # =====================================================================
 # Logs helper
 # =====================================================================
@@ -292,21 +554,86 @@ def tail_log(n_lines: int = 200) -> str:
     except Exception as e:
         return f"Cannot read log: {e}"
 
+# =====================================================================
+# Metrics helper
+# =====================================================================
+
+METRIC_HEADERS = ["stage", "count", "errors", "error %", "p50 ms", "p95 ms", "p99 ms"]
+
+
+def metrics_view():
+    """(summary rows, markdown with cache hit rates, raw Prometheus text)."""
+    caches = metrics.cache_summary()
+    md = " · ".join(f"**{k}** hit rate: {v:.0%}" for k, v in caches.items()) or "(no cache lookups yet)"
+    return metrics.stage_summary(), md, metrics.render_prometheus()
+
+# =====================================================================
+# Warm-up / readiness
+# =====================================================================
+
+READY = threading.Event()
+WARMUP_STAGES: list[tuple[str, float]] = []
+metrics.gauge("ready", lambda: float(READY.is_set()), "1 once warm-up has finished")
+
+
+def _report_stages(title: str, stages: list[tuple[str, float]], total: float) -> None:
+    lines = [f"{title}: {total:.2f} s"] + [f"  {name:<22} {sec * 1000:9.1f} ms" for name, sec in stages]
+    for line in lines:
+        log.info(line)
+    print("\n".join(lines), flush=True)
+
+
+def _warmup():
+    """Pay first-request costs (imports, catalog load, first search) before the first visitor does."""
+    t0 = time.perf_counter()
+    steps = [
+        ("import pandas", lambda: __import__("pandas")),
+        ("import websockets", lambda: __import__("websockets")),
+        ("load_courses_df", load_courses_df),
+        ("search_courses", lambda: search_courses("python", None, [], [])),
+        ("enrollment_rollups", enrollment_rollups),
+        ("tail_log", tail_log),
+    ]
+    for name, fn in steps:
+        t = time.perf_counter()
+        try:
+            with metrics.suppressed():  # keep warm-up out of the request metrics
+                fn()
+        except Exception:
+            log.exception("Warm-up step failed: %s", name)
+        WARMUP_STAGES.append((name, time.perf_counter() - t))
+    READY.set()
+    _report_stages("Warm-up", WARMUP_STAGES, time.perf_counter() - t0)
+
+
+def start_warmup() -> threading.Thread:
+    th = threading.Thread(target=_warmup, name="warmup", daemon=True)
+    th.start()
+    return th
+
+
+def readiness_text() -> str:
+    if READY.is_set():
+        return "✅ Hazır"
+    return "⏳ Hazırlanıyor… (katalog yükleniyor, ilk arama biraz sürebilir)"
+
 # =====================================================================
 # Chat wiring
 # =====================================================================
 
+@metrics.timed("respond")
 def respond(message: str,
             chat_history: List[Tuple[str, str]],
             system_prompt: str,
             auto_search: bool,
             max_price: Optional[float],
             durations: List[str],
-            providers: List[str]):
+            providers: List[str],
+            session_id: Optional[str] = None):
     log.info("User: %s", (message or "")[:200])
     chat_history = chat_history + [(message, "")]
     try:
-        answer = call_backend_chat(message, chat_history[:-1], system_prompt)
+        answer = call_backend_chat(message, chat_history[:-1], system_prompt, session_id)
     except Exception as e:
         log.exception("Backend chat failed")
         answer = f"❌ Sunucuya ulaşılamadı: {e}"
@@ -327,15 +654,15 @@ def clear_chat():
     return [], ""
 
 
-def export_chat(history: List[Tuple[str, str]]):
+def export_chat(session_id: Optional[str]):
+    if not session_id:
+        return "Dışa aktarılacak sohbet yok."
     ts = time.strftime("%Y%m%d-%H%M%S")
     out_dir = PROJECT_ROOT / "logs" / "chats"
     out_dir.mkdir(parents=True, exist_ok=True)
-    data = [{"user": u, "assistant": a} for (u, a) in history]
     path = out_dir / f"chat-{ts}.json"
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    log.info("Saved chat export: %s", path)
+    n = CHAT_STORE.export(session_id, path)
+    log.info("Saved chat export: %s (%d turns)", path, n)
     return f"Kaydedildi: {path}"
 
 # =====================================================================
@@ -346,6 +673,10 @@ def build_ui():
     theme = gr.themes.Soft(primary_hue="indigo", neutral_hue="slate")
     with gr.Blocks(theme=theme, title="kursbul — Asistan") as demo:
         gr.Markdown("## kursbul — Asistan")
+        ready_md = gr.Markdown(readiness_text)  # evaluated on every page load
+        ready_timer = gr.Timer(1.0, active=not READY.is_set())
+        ready_timer.tick(lambda: (readiness_text(), gr.Timer(active=not READY.is_set())),
+                         None, [ready_md, ready_timer])
 
         with gr.Row(equal_height=True):
             # Left: Chat
@@ -399,32 +730,63 @@ def build_ui():
                     results_md = gr.Markdown("")
                     results_df = gr.Dataframe(type="pandas", interactive=False, label="Tablo görünümü")
 
+                with gr.Tab("Kayıtlar"):
+                    with gr.Row():
+                        rollup_period = gr.Radio(["month", "day"], value="month", label="Periyot")
+                        rollup_level = gr.Dropdown(["", "Beginner", "Intermediate", "Advanced"], value="",
+                                                   label="Seviye")
+                    rollup_course = gr.Textbox(label="Kurs (tam ad, boş: hepsi)")
+                    rollup_refresh = gr.Button("Göster")
+                    rollup_md = gr.Markdown("")
+                    rollup_df = gr.Dataframe(type="pandas", interactive=False, label="Kayıt özeti")
+                    rollup_refresh.click(enrollment_rollups, [rollup_period, rollup_course, rollup_level],
+                                         [rollup_md, rollup_df])
+
                 with gr.Tab("Logs"):
                     n_lines = gr.Slider(50, 2000, value=400, step=50, label="Son N satır")
-                    log_box = gr.Textbox(value=tail_log(400), lines=18, interactive=False, label=str(LOG_FILE),
+                    log_box = gr.Textbox(value=lambda: tail_log(400), lines=18, interactive=False, label=str(LOG_FILE),
                                          show_copy_button=True)
                     refresh = gr.Button("Yenile")
                     refresh.click(lambda n: tail_log(int(n)), n_lines, log_box)
                     gr.Timer(2.0).tick(lambda n: tail_log(int(n)), n_lines, log_box)
 
-        # State
-        state = gr.State([])  # list[(user, assistant)]
+                with gr.Tab("Metrics"):
+                    metrics_table = gr.Dataframe(headers=METRIC_HEADERS, interactive=False,
+                                                 label="Aşama gecikmeleri")
+                    metrics_cache = gr.Markdown("")
+                    with gr.Accordion("Prometheus", open=False):
+                        metrics_raw = gr.Textbox(lines=12, interactive=False, show_copy_button=True,
+                                                 label="/metrics")
+                    metrics_refresh = gr.Button("Yenile")
+                    metrics_refresh.click(metrics_view, None, [metrics_table, metrics_cache, metrics_raw])
+
+        # State: only the session id (assigned on first send); turns are in CHAT_STORE
+        session_id = gr.State(None)
 
         # Wiring
-        def _on_send(user_msg, history, sys_prompt, auto_s, price, dur, provs):
+        def _on_send(user_msg, sys_prompt, auto_s, price, dur, provs, sid):
             if not (user_msg and str(user_msg).strip()):
-                return gr.update(), history, "", None
-            new_history, md, df = respond(user_msg, history, sys_prompt, auto_s, price, dur, provs)
-            return new_history, new_history, md, df
+                return gr.update(), "", None, sid
+            sid = sid or uuid.uuid4().hex
+            history = CHAT_STORE.history(sid)
+            new_history, md, df = respond(user_msg, history, sys_prompt, auto_s, price, dur, provs, sid)
+            CHAT_STORE.append(sid, *new_history[-1])
+            return new_history, md, df, sid
 
         send.click(
             _on_send,
-            inputs=[msg, state, system_prompt, auto_search, max_price, durations, providers],
-            outputs=[chatbot, state, results_md, results_df]
+            inputs=[msg, system_prompt, auto_search, max_price, durations, providers, session_id],
+            outputs=[chatbot, results_md, results_df, session_id],
+            api_name="chat",  # stable HTTP API name, used by benchmarks.loadtest
         ).then(lambda: "", None, msg)
 
-        clear.click(lambda: ([], []), None, [chatbot, state])
-        export.click(lambda h: export_chat(h), state, results_md)
+        def _on_clear(sid):
+            if sid:
+                CHAT_STORE.delete(sid)
+            return [], None
+
+        clear.click(_on_clear, session_id, [chatbot, session_id])
+        export.click(export_chat, session_id, results_md)
 
         # quick chips fill the input
         ex1.click(lambda: "Ücretsiz Python başlangıç kursu", None, msg)
@@ -440,6 +802,13 @@ def build_ui():
 if __name__ == "__main__":
     host = os.getenv("GRADIO_HOST", "127.0.0.1")
     port = int(os.getenv("GRADIO_PORT", "7860"))
-    app = build_ui()
+    metrics_port = os.getenv("METRICS_PORT")
+    if metrics_port:
+        metrics.start_http_server(int(metrics_port), os.getenv("METRICS_HOST", host), ready=READY.is_set)
+        log.info("Prometheus metrics at http://%s:%s/metrics", os.getenv("METRICS_HOST", host), metrics_port)
+    start_warmup()  # runs while the UI is built and the server starts accepting connections
+    with _startup_stage("build_ui"):
+        app = build_ui()
+    _report_stages("Startup", STARTUP_STAGES, time.perf_counter() - _T0)
     log.info("Launching Gradio at http://%s:%d", host, port)
     app.queue().launch(server_name=host, server_port=port, inbrowser=True, show_error=True)